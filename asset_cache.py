@@ -0,0 +1,54 @@
+import threading
+from functools import lru_cache
+from PIL import Image, ImageFont
+from settings import TEMPLATE_PATHS, TEMPLATES, DEFAULT_FONT, APP_LOGO_PATH, APP_LOGO_SIZES
+
+# Process-wide cache of decoded export assets. Each template PNG is decoded once and
+# kept as a pristine base image; callers get a cheap copy to draw on. Fonts are parsed
+# once per (path, size), and the app logo is decoded and resized once per size.
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+# Decode a template once and keep it as the pristine base image
+def _load_template(template_type):
+    template_path = TEMPLATE_PATHS.get(template_type, TEMPLATE_PATHS["post"])
+    with _templates_lock:
+        base = _templates.get(template_path)
+        if base is None:
+            with Image.open(template_path) as image:
+                image.load()  # Force the PNG decode now instead of on first draw
+                base = image.copy()
+            _templates[template_path] = base
+    return base
+
+# Return a fresh, drawable copy of the decoded template image
+def get_template_image(template_type):
+    return _load_template(template_type).copy()
+
+# Return a FreeTypeFont, parsing the font file only once per (path, size)
+@lru_cache(maxsize=32)
+def get_font(path, size):
+    return ImageFont.truetype(path, size)
+
+# Return the app logo resized to size x size. Callers must not modify the image.
+@lru_cache(maxsize=8)
+def get_logo(size):
+    with Image.open(APP_LOGO_PATH) as image:
+        return image.resize((size, size), Image.LANCZOS)
+
+# Decode every template ahead of time (used to warm the cache off the UI thread)
+def preload_templates():
+    for template_type in TEMPLATE_PATHS:
+        _load_template(template_type)
+
+# Parse every font size the templates use
+def preload_fonts():
+    for template in TEMPLATES.values():
+        for size in template["font_sizes"].values():
+            get_font(DEFAULT_FONT, size)
+
+# Resize the logo to every size the login screen and main window show
+def preload_logos():
+    for size in APP_LOGO_SIZES:
+        get_logo(size)
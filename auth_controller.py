@@ -1,9 +1,11 @@
-from firebase_admin import auth
-from firebase_config import db
+from firebase_config import auth, db
 from dotenv import load_dotenv
 import os
-import requests
 import json
+import threading
+import http_client
+from session_cache import save_session, clear_session
+from settings import REMEMBER_SESSION
 
 # Load environment variables
 load_dotenv()
@@ -58,8 +60,15 @@ def delete_user(uid):
         print(f"Error deleting user: {e}")
         return None
 
-# Verify user credentials using Firebase REST API. Returns: tuple of (uid, error_message
-def verify_password(email, password):
+# Refresh token errors that mean the saved session is no longer usable
+SESSION_REVOKED_ERRORS = (
+    "TOKEN_EXPIRED", "USER_DISABLED", "USER_NOT_FOUND",
+    "INVALID_REFRESH_TOKEN", "INVALID_GRANT_TYPE", "MISSING_REFRESH_TOKEN"
+)
+
+# Sign in with email and password using the Firebase REST API.
+# Returns: tuple of ({"uid", "id_token", "refresh_token", "expires_in"}, error_message)
+def sign_in_with_password(email, password):
     web_api_key = os.getenv("FIREBASE_WEB_API_KEY")
     if not web_api_key:
         return None, "Firebase Web API key not configured in .env file"
@@ -74,11 +83,16 @@ def verify_password(email, password):
             "returnSecureToken": True
         }
         
-        response = requests.post(url, json=payload)
+        response = http_client.post(url, json=payload)
         data = response.json()
         
         if response.status_code == 200:
-            return data.get('localId'), None  # Return user ID
+            return {
+                "uid": data.get('localId'),
+                "id_token": data.get('idToken'),
+                "refresh_token": data.get('refreshToken'),
+                "expires_in": int(data.get('expiresIn', 0))
+            }, None
         else:
             error_msg = data.get('error', {}).get('message', 'Unknown error occurred')
             return None, error_msg
@@ -86,6 +100,89 @@ def verify_password(email, password):
     except Exception as e:
         return None, str(e)
 
+# Verify user credentials using Firebase REST API. Returns: tuple of (uid, error_message)
+def verify_password(email, password):
+    tokens, error_msg = sign_in_with_password(email, password)
+    return (tokens["uid"] if tokens else None), error_msg
+
+# Exchange a refresh token for a new ID token using the Secure Token REST API.
+# Returns: tuple of ({"uid", "id_token", "refresh_token", "expires_in"}, error_message)
+def refresh_id_token(refresh_token):
+    web_api_key = os.getenv("FIREBASE_WEB_API_KEY")
+    if not web_api_key:
+        return None, "Firebase Web API key not configured in .env file"
+
+    try:
+        url = f"https://securetoken.googleapis.com/v1/token?key={web_api_key}"
+        payload = {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token
+        }
+
+        response = http_client.post(url, data=payload)
+        data = response.json()
+
+        if response.status_code == 200:
+            return {
+                "uid": data.get('user_id'),
+                "id_token": data.get('id_token'),
+                "refresh_token": data.get('refresh_token'),
+                "expires_in": int(data.get('expires_in', 0))
+            }, None
+        else:
+            error_msg = data.get('error', {}).get('message', 'Unknown error occurred')
+            return None, error_msg
+
+    except Exception as e:
+        return None, str(e)
+
+# Create the Firestore client if nothing has yet; errors surface on the real read
+def _warm_db():
+    try:
+        db.resolve()
+    except Exception:
+        pass
+
+# Full login: password sign-in, then the user's profile from Firestore. Creating the
+# Firestore client (if the preloader hasn't finished it) overlaps the sign-in request.
+# Runs on a worker thread. Returns: tuple of ({"uid", "user_data", "tokens"}, error_message)
+def login(email, password):
+    if not db.ready:
+        threading.Thread(target=_warm_db, name="login-firestore", daemon=True).start()
+
+    tokens, error_msg = sign_in_with_password(email, password)
+    if error_msg:
+        return None, error_msg
+
+    uid = tokens["uid"]
+    user_doc = db.collection('users').document(uid).get()
+    if not user_doc.exists:
+        return None, "User data not found"
+
+    user_data = user_doc.to_dict()
+    if REMEMBER_SESSION and tokens["refresh_token"]:
+        save_session(uid, tokens["refresh_token"], user_data)
+    return {"uid": uid, "user_data": user_data, "tokens": tokens}, None
+
+# Restore a saved session with a token refresh and the cached profile, skipping the
+# password sign-in and the Firestore read. A revoked or expired session is deleted.
+# Returns: tuple of ({"uid", "user_data", "tokens"}, error_message)
+def restore_session(session):
+    tokens, error_msg = refresh_id_token(session["refresh_token"])
+    if error_msg:
+        if any(error in error_msg for error in SESSION_REVOKED_ERRORS):
+            clear_session()
+        return None, error_msg
+
+    if tokens["uid"] != session["uid"]:
+        clear_session()
+        return None, "Saved session belongs to a different user"
+
+    # Refresh tokens can be rotated; keep the latest one
+    if tokens["refresh_token"] and tokens["refresh_token"] != session["refresh_token"]:
+        save_session(session["uid"], tokens["refresh_token"], session.get("user_data"))
+    return {"uid": session["uid"], "user_data": session.get("user_data") or {}, "tokens": tokens}, None
+
 
 def send_password_reset_email_rest(email):
     firebase_api_key = os.getenv("FIREBASE_WEB_API_KEY")  # Must be in your .env file
@@ -95,7 +192,7 @@ def send_password_reset_email_rest(email):
         "email": email
     }
 
-    response = requests.post(url, json=payload)
+    response = http_client.post(url, json=payload)
     if response.status_code == 200:
         return True, None
     else:
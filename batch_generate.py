@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import replace
+from functools import partial
+from dotenv import load_dotenv
+from fetch_engine import FetchBatch
+from geocode_cache import GeocodeCache, geocode_cache
+from image_renderer import render_weather_image, save_weather_image
+from owm_transport import configure_from_env as configure_transport_from_env
+from settings import TEMPLATES, OWM_CALLS_PER_MINUTE
+from weather_batch import process_weather_batch
+from weather_forecast import process_forecast
+from weather_service import fetch_weather_data, template_parts, coalescing_stats, rate_limit_stats, owm_api_key
+
+# Headless batch generator: reads a job file, then runs fetch -> process -> render
+# for every city group without tkinter, ttkbootstrap or Firebase.
+#
+# Job file (JSON):
+# {
+#     "template": "post",            # "post", "story" or a list of both
+#     "output_dir": "output",
+#     "pdf": false,                  # Also write a PDF next to each PNG
+#     "forecast": true,              # Draw the daily forecast line (false: current weather only)
+#     "groups": [
+#         {"name": "east-coast", "locations": [
+#             {"city": "Boston", "state": "Massachusetts", "country": "US"},
+#             {"city": "Florence", "country": "IT"}
+#         ]}
+#     ]
+# }
+#
+# Usage: python batch_generate.py jobs.json [--workers 8] [--deadline 300]
+
+DEFAULT_WORKERS = 8
+DEADLINE_SLACK = 60  # Seconds added to the derived fetch deadline (timeouts, a 429 pause)
+
+# Seconds the fetch stage needs at the rate limiter's steady rate: one One Call request
+# per location, plus a geocode request for each location not in the geocode cache yet.
+# A fixed deadline would cap a cold batch at whatever the per-minute budget allows.
+def fetch_deadline(locations):
+    calls = sum(1 if geocode_cache.get(*location) else 2 for location in locations)
+    return calls * 60 / OWM_CALLS_PER_MINUTE + DEADLINE_SLACK
+
+# Read and validate the job file. Returns (job, error)
+def load_job(job_path):
+    try:
+        with open(job_path, "r") as f:
+            job = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return None, f"Could not read job file {job_path}: {e}"
+
+    templates = job.get("template", "post")
+    if isinstance(templates, str):
+        templates = [templates]
+    unknown = [t for t in templates if t not in TEMPLATES]
+    if unknown:
+        return None, f"Unknown template type(s): {', '.join(unknown)}"
+
+    groups = job.get("groups") or []
+    if not groups:
+        return None, "Job file has no city groups"
+
+    for number, group in enumerate(groups, start=1):
+        group.setdefault("name", f"group_{number}")
+        for location in group.get("locations", []):
+            if not location.get("city") or not location.get("country"):
+                return None, f"Group '{group['name']}' has a location without a city or country"
+            location["country"] = location["country"].strip().upper()
+            location["state"] = location.get("state", "").strip()
+            if location["country"] == "US" and not location["state"]:
+                return None, f"Group '{group['name']}' has a US location without a state"
+
+        slots = len(TEMPLATES[templates[0]]["city_position"])
+        if len(group.get("locations", [])) > slots:
+            print(f"Warning: group '{group['name']}' has more than {slots} locations; "
+                  f"only the first {slots} fit on a template")
+
+    job["template"] = templates
+    job["groups"] = groups
+    job.setdefault("output_dir", "output")
+    job.setdefault("pdf", False)
+    job.setdefault("forecast", True)
+    return job, None
+
+# Turn a group name into a safe file name
+def safe_filename(name):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "group"
+
+# Print one line of the per-stage summary
+def print_stage(name, count, unit, seconds):
+    rate = count / seconds if seconds > 0 else float("inf")
+    print(f"  {name:<8} {count:>6} {unit:<10} {seconds:>8.2f}s  {rate:>10.1f} {unit}/s")
+
+# deadline is in seconds for the whole fetch stage; None derives it with fetch_deadline()
+def run_job(job, workers=DEFAULT_WORKERS, deadline=None):
+    os.makedirs(job["output_dir"], exist_ok=True)
+
+    # Every distinct location is fetched once, however many groups it appears in
+    unique_locations = {}
+    for group in job["groups"]:
+        for location in group["locations"]:
+            key = GeocodeCache.make_key(location["city"], location["state"], location["country"])
+            unique_locations.setdefault(key, (location["city"], location["state"], location["country"]))
+
+    # Only request the One Call parts the job's templates actually draw
+    parts = frozenset().union(*(template_parts(t, job["forecast"]) for t in job["template"]))
+    print(f"Requesting One Call parts: {', '.join(sorted(parts))}")
+
+    if deadline is None:
+        deadline = fetch_deadline(unique_locations.values())
+    print(f"Fetch deadline: {deadline:.0f}s for {len(unique_locations)} location(s)")
+
+    # Stage 1: fetch. Past the deadline the rate limiter hands out no more tokens, so
+    # requests still queued or retrying when it runs out never spend quota.
+    started = time.perf_counter()
+    fetch = partial(fetch_weather_data, parts=parts, deadline=time.monotonic() + deadline)
+    batch = FetchBatch(list(unique_locations.values()), fetch,
+                       max_workers=workers, deadline=deadline).start()
+    payloads = {}
+    failures = 0
+    while len(payloads) + failures < batch.total:
+        index, (city, state, country), data, error = batch.results.get()
+        if error or not data:
+            print(f"Error for {city}, {country}: {error or 'no data returned'}")
+            failures += 1
+            continue
+        payloads[GeocodeCache.make_key(city, state, country)] = data
+    fetch_seconds = time.perf_counter() - started
+
+    # Stage 2: process every payload at once in columnar form
+    started = time.perf_counter()
+    keys = list(payloads)
+    batch_weather = process_weather_batch(payloads[key] for key in keys)
+    processed = {key: batch_weather.snapshot(i) for i, key in enumerate(keys)}
+    if "daily" in parts:
+        for key, weather in processed.items():
+            weather.forecast = process_forecast(payloads[key])
+    process_seconds = time.perf_counter() - started
+
+    # Stage 3 and 4: render and save every group in every requested template
+    render_seconds = 0.0
+    save_seconds = 0.0
+    images = 0
+    files = []
+    for group in job["groups"]:
+        weather_list = []
+        for location in group["locations"]:
+            key = GeocodeCache.make_key(location["city"], location["state"], location["country"])
+            weather = processed.get(key)
+            if weather:
+                # Same weather, this group's spelling of the location
+                weather_list.append(replace(weather, city=location["city"],
+                                            state=location["state"], country=location["country"]))
+
+        if not weather_list:
+            print(f"Skipping group '{group['name']}': no weather data")
+            continue
+
+        for template_type in job["template"]:
+            started = time.perf_counter()
+            image = render_weather_image(weather_list, template_type)
+            render_seconds += time.perf_counter() - started
+
+            started = time.perf_counter()
+            filename = f"{safe_filename(group['name'])}_{template_type}"
+            png_path, pdf_path = save_weather_image(image, job["output_dir"], filename, save_pdf=job["pdf"])
+            save_seconds += time.perf_counter() - started
+
+            images += 1
+            files.extend(path for path in (png_path, pdf_path) if path)
+
+    print(f"\nGenerated {images} image(s) in {job['output_dir']}")
+    print("Stage summary:")
+    print_stage("fetch", len(unique_locations), "locations", fetch_seconds)
+    print_stage("process", len(processed), "records", process_seconds)
+    print_stage("render", images, "images", render_seconds)
+    print_stage("save", len(files), "files", save_seconds)
+    coalesced = coalescing_stats()
+    print(f"  {coalesced['geocode']['deduplicated']} geocode and {coalesced['onecall']['deduplicated']} "
+          f"One Call request(s) shared an identical request in flight")
+    limits = rate_limit_stats()
+    print(f"  rate limiter: waited {limits['waited_seconds']:.1f}s, {limits['throttled']} 429(s), "
+          f"{limits['daily_used']}/{limits['daily_budget']} One Call requests used today")
+    if failures:
+        print(f"  {failures} location(s) failed to fetch")
+
+    return failures == 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate weather posts for many city groups without the GUI")
+    parser.add_argument("job_file", help="Path to the JSON job file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel fetch workers")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="Seconds allowed for the fetch stage (default: derived from the rate limit)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    configure_transport_from_env()  # Optional OWM record/replay (see owm_transport.py)
+    if not owm_api_key():
+        print("OpenWeatherMap API key not found in .env file")
+        return 1
+
+    job, error = load_job(args.job_file)
+    if error:
+        print(error)
+        return 1
+
+    return 0 if run_job(job, workers=args.workers, deadline=args.deadline) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
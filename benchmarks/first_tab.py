@@ -0,0 +1,86 @@
+import argparse
+import random
+import statistics
+import time
+import tkinter as tk
+from tkinter import ttk
+from ttkbootstrap import Window
+from benchmarks.process_batch import make_payload
+from city_tab import CityTabPool
+from icon_atlas import icon_atlas
+from weather_forecast import process_forecast
+from weather_snapshot import WeatherSnapshot
+
+# Benchmark: time-to-first-tab with LAZY_TAB_BUILD on and off. Follows the path
+# poll_weather_batch takes when every location of a fetch arrives at once:
+#   eager - each tab's widgets are built as soon as it is shown
+#   lazy  - only the selected tab is built; the rest are built one per idle callback
+# "first tab" ends when the first tab has been built and drawn, "all tabs" when every
+# tab is built. Needs a display (use xvfb-run on a headless machine).
+# Usage (from the project root): python -m benchmarks.first_tab --locations 5 --runs 10
+
+def make_weather(count, seed):
+    rng = random.Random(seed)
+    weather = []
+    for i in range(count):
+        payload = make_payload(rng)
+        now = int(time.time())
+        payload["daily"] = [{"dt": now + 86400 * day, "temp": {"min": 10 + day, "max": 20 + day},
+                             "weather": [{"main": "Clear", "icon": "01d"}]} for day in range(8)]
+        weather.append(WeatherSnapshot.from_payload(payload, f"City {i}", "", "XX", process_forecast(payload)))
+    return weather
+
+# One fetch's worth of tabs in a fresh notebook. Returns (first tab seconds, all tabs seconds)
+def run_sample(root, weather, lazy):
+    notebook = ttk.Notebook(root)
+    notebook.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    pool = CityTabPool(notebook)
+
+    started = time.perf_counter()
+    tabs = [pool.show(i, w, w.city, w.state, w.country) for i, w in enumerate(weather)]
+    notebook.select(0)
+    if lazy:
+        tabs[0].build()
+    else:
+        for tab in tabs:
+            tab.build()
+    root.update()  # Draw the selected tab
+    first = time.perf_counter() - started
+
+    # Lazy: the remaining tabs are built while the GUI is idle, one per callback
+    pending = [tab for tab in tabs if not tab.built]
+    while pending:
+        pending.pop(0).build()
+        root.update()
+    total = time.perf_counter() - started
+
+    notebook.destroy()
+    return first, total
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-tab with lazy vs eager tab building")
+    parser.add_argument("--locations", type=int, default=5, help="Tabs per fetch (the GUI allows up to 5)")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    root = Window(themename="pulse")
+    root.geometry("950x1100")
+    icon_atlas.load()  # Both modes start with a warm icon atlas, as after login
+    weather = make_weather(args.locations, args.seed)
+    run_sample(root, weather, lazy=False)  # Warm-up: fonts, theme images
+
+    print(f"Median of {args.runs} runs, {args.locations} tabs")
+    results = {}
+    for name, lazy in (("eager", False), ("lazy", True)):
+        samples = [run_sample(root, weather, lazy) for _ in range(args.runs)]
+        first = statistics.median(s[0] for s in samples) * 1000
+        total = statistics.median(s[1] for s in samples) * 1000
+        results[name] = first
+        print(f"  {name:<5} first tab {first:8.1f} ms   all tabs {total:8.1f} ms")
+    print(f"  first tab speedup {results['eager'] / results['lazy']:.1f}x")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+import weather_service
+from benchmarks.process_batch import make_payload
+from fetch_engine import FetchBatch
+from geocode_cache import GeocodeCache
+from owm_transport import FixtureStore, ReplayPolicy, enable_replay, create_server
+from rate_limiter import RateLimiter
+from settings import ONECALL_PARTS, GUI_ONECALL_PARTS
+from single_flight import SingleFlight
+from weather_cache import WeatherCache
+
+# Benchmark: fetch_weather_data throughput and latency against recorded OpenWeatherMap
+# fixtures, fully offline. Without --fixtures a synthetic set is generated.
+# Usage (from the project root):
+#   python -m benchmarks.owm_throughput --cities 200 --workers 8 --latency-ms 80
+#   python -m benchmarks.owm_throughput --fixtures fixtures --mode server --error-rate 0.05
+
+# Write geocode and One Call fixtures for `count` made-up cities
+def make_fixtures(store, count, parts, seed):
+    rng = random.Random(seed)
+    locations = []
+    for i in range(count):
+        city, country = f"Benchville {i}", "XX"
+        lat, lon = round(rng.uniform(-60, 60), 4), round(rng.uniform(-180, 180), 4)
+        geocode = [{"name": city, "lat": lat, "lon": lon, "country": country}]
+        store.save(weather_service.geocode_url(city, "", country, "replay"), 200,
+                   json.dumps(geocode).encode("utf-8"))
+
+        payload = make_payload(rng)
+        payload.update(lat=lat, lon=lon)
+        now = int(time.time())
+        payload["daily"] = [{"dt": now + 86400 * day, "temp": {"min": 10 + day, "max": 20 + day},
+                             "weather": [{"main": "Clear", "icon": "01d"}]} for day in range(8)]
+        store.save(weather_service.onecall_url(lat, lon, parts, "replay"), 200,
+                   json.dumps(weather_service.project_payload(payload, parts)).encode("utf-8"))
+        locations.append((city, "", country))
+    return locations
+
+# Recover the recorded locations and One Call parts from a fixture directory
+def read_fixtures(store):
+    locations, parts = [], set(GUI_ONECALL_PARTS)
+    for name in sorted(os.listdir(store.path)):
+        with open(os.path.join(store.path, name), "r") as f:
+            query = dict(parse_qsl(urlsplit(json.load(f)["request"]).query))
+        if name.startswith("geocode_"):
+            fields = query["q"].split(",")
+            state = fields[1] if len(fields) == 3 else ""
+            locations.append((fields[0], state, fields[-1]))
+        elif "exclude" in query:
+            parts = set(ONECALL_PARTS) - set(query["exclude"].split(","))
+    return locations, frozenset(parts)
+
+# Give weather_service fresh caches, coalescers and a rate limiter so each run measures
+# the transport instead of what earlier runs (or the real app) left behind
+def reset_service_state(per_minute, usage_path):
+    weather_service.geocode_cache = GeocodeCache(path=":memory:")
+    weather_service.weather_cache = WeatherCache()
+    weather_service.geocode_flight = SingleFlight("geocode")
+    weather_service.onecall_flight = SingleFlight("onecall")
+    weather_service.owm_rate_limiter = RateLimiter(
+        per_minute=per_minute or 10**9, per_day=10**9, usage_path=usage_path)
+
+def run_pass(locations, parts, workers):
+    latencies = []
+    lock = threading.Lock()
+
+    def timed_fetch(city, state, country):
+        started = time.perf_counter()
+        result = weather_service.fetch_weather_data(city, state, country, parts=parts)
+        with lock:
+            latencies.append(time.perf_counter() - started)
+        return result
+
+    started = time.perf_counter()
+    batch = FetchBatch(locations, timed_fetch, max_workers=workers, deadline=600).start()
+    errors = 0
+    for _ in range(batch.total):
+        _, _, data, error = batch.results.get()
+        if error or not data:
+            errors += 1
+    return time.perf_counter() - started, latencies, errors
+
+def print_pass(name, locations, seconds, latencies, errors):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+    print(f"  {name:<5} {len(locations) / seconds:8.1f} loc/s  {seconds:7.2f}s  "
+          f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+          f"max {latencies[-1] * 1000:7.1f} ms  errors {errors}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline fetch_weather_data throughput benchmark")
+    parser.add_argument("--fixtures", help="Recorded fixture directory (default: synthetic)")
+    parser.add_argument("--cities", type=int, default=200, help="Synthetic cities to generate")
+    parser.add_argument("--mode", choices=("adapter", "server"), default="adapter",
+                        help="Replay in-process or through the local stand-in server")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--per-minute", type=int, default=0, help="Rate limit budget (0: unlimited)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    if args.fixtures:
+        store = FixtureStore(args.fixtures)
+        locations, parts = read_fixtures(store)
+    else:
+        store = FixtureStore(os.path.join(scratch.name, "fixtures"))
+        parts = frozenset(GUI_ONECALL_PARTS)
+        locations = make_fixtures(store, args.cities, parts, args.seed)
+
+    policy = ReplayPolicy(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, seed=args.seed)
+    if args.mode == "server":
+        server = create_server(store.path, port=0, policy=policy)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        os.environ["OWM_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    else:
+        enable_replay(store.path, weather_service.owm_base_url(), policy)
+
+    reset_service_state(args.per_minute, os.path.join(scratch.name, "usage.json"))
+    print(f"{len(locations)} locations, {args.workers} workers, {args.mode} replay, "
+          f"{args.latency_ms:g}+{args.jitter_ms:g} ms latency, {args.error_rate:.0%} errors")
+
+    # Cold: every location is geocoded and fetched. Warm: served from the caches.
+    for name in ("cold", "warm"):
+        seconds, latencies, errors = run_pass(locations, parts, args.workers)
+        print_pass(name, locations, seconds, latencies, errors)
+
+    print(f"  coalesced: {weather_service.coalescing_stats()}")
+    print(f"  rate limit: {weather_service.rate_limit_stats()}")
+    weather_service.owm_rate_limiter.flush()
+    scratch.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import random
+import time
+from weather_batch import process_weather_batch
+from weather_service import process_weather_data
+
+# Benchmark: process_weather_data called once per payload vs process_weather_batch.
+# Usage (from the project root): python -m benchmarks.process_batch --count 10000
+
+CONDITIONS = (("Clear", "clear sky", "01d"), ("Clouds", "broken clouds", "04d"),
+              ("Rain", "light rain", "10d"), ("Snow", "snow", "13n"))
+
+# Build a One Call-shaped payload with random but realistic values
+def make_payload(rng):
+    now = int(time.time())
+    main, description, icon = rng.choice(CONDITIONS)
+    temp = rng.uniform(-20, 40)
+    return {
+        "timezone": "America/New_York",
+        "timezone_offset": rng.choice((-18000, -14400, 0, 3600, 19800, 32400)),
+        "current": {
+            "dt": now,
+            "sunrise": now - rng.randint(0, 40000),
+            "sunset": now + rng.randint(0, 40000),
+            "temp": temp,
+            "feels_like": temp - rng.uniform(0, 5),
+            "pressure": rng.randint(980, 1040),
+            "humidity": rng.randint(10, 100),
+            "dew_point": temp - rng.uniform(0, 10),
+            "uvi": rng.uniform(0, 11),
+            "clouds": rng.randint(0, 100),
+            "visibility": rng.choice((10000, 8000, 0)),
+            "wind_speed": rng.uniform(0, 20),
+            "wind_deg": rng.randint(0, 359),
+            "wind_gust": rng.uniform(0, 30),
+            "weather": [{"main": main, "description": description, "icon": icon}]
+        },
+        "daily": [{"temp": {"min": temp - 5, "max": temp + 5}}]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-payload and columnar weather processing")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    payloads = [make_payload(rng) for _ in range(args.count)]
+
+    started = time.perf_counter()
+    rows = [process_weather_data(data) for data in payloads]
+    per_payload_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = process_weather_batch(payloads)
+    batch_seconds = time.perf_counter() - started
+
+    # The row view must match the per-payload output (the clock may tick between runs)
+    mismatches = 0
+    for i in range(0, args.count, max(1, args.count // 100)):
+        expected = dict(rows[i], current_time=None, current_date=None)
+        actual = dict(batch.row(i), current_time=None, current_date=None)
+        if expected != actual:
+            mismatches += 1
+
+    print(f"{args.count} payloads")
+    print(f"  process_weather_data  {per_payload_seconds * 1000:8.1f} ms")
+    print(f"  process_weather_batch {batch_seconds * 1000:8.1f} ms")
+    print(f"  speedup               {per_payload_seconds / batch_seconds:8.1f}x")
+    print(f"  row mismatches        {mismatches:8d} (sampled)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Benchmark: how long the app takes to import, with Firebase left lazy, versus paying
+# for Firebase Admin + Firestore + Storage setup up front as the old firebase_config
+# did at import time. Each sample runs in a fresh interpreter so nothing is cached.
+# Usage (from the project root): python -m benchmarks.startup_time --runs 5
+
+SAMPLE = """
+import json, time
+started = time.perf_counter()
+import weather_api
+imported = time.perf_counter()
+result = {"import": imported - started}
+if %(eager)r:
+    import firebase_config
+    try:
+        firebase_config.db.resolve()
+        firebase_config.bucket.resolve()
+        firebase_config.auth.resolve()
+        result["firebase"] = time.perf_counter() - imported
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+print(json.dumps(result))
+"""
+
+def sample(eager):
+    output = subprocess.run(
+        [sys.executable, "-c", SAMPLE % {"eager": eager}],
+        capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app import time with lazy vs eager Firebase")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    lazy = [sample(eager=False)["import"] for _ in range(args.runs)]
+    eager = [sample(eager=True) for _ in range(args.runs)]
+
+    lazy_ms = statistics.median(lazy) * 1000
+    print(f"Median of {args.runs} fresh interpreters")
+    print(f"  import weather_api (Firebase lazy)     {lazy_ms:8.1f} ms")
+
+    errors = [run["error"] for run in eager if "error" in run]
+    if errors:
+        print(f"  Firebase setup could not run here: {errors[0]}")
+        return
+
+    firebase_ms = statistics.median(run["firebase"] for run in eager) * 1000
+    print(f"  + Firebase init (old import-time cost) {firebase_ms:8.1f} ms")
+    print(f"  time saved before the login window     {firebase_ms:8.1f} ms "
+          f"({firebase_ms / (lazy_ms + firebase_ms):.0%} of the old startup)")
+
+if __name__ == "__main__":
+    main()
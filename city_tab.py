@@ -0,0 +1,416 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+import ttkbootstrap as ttkb
+from icon_atlas import icon_atlas
+from settings import WEATHER_ICON_SIZE, FORECAST_ICON_SIZE, FORECAST_DAYS
+
+# (title, value, max_value, unit, style) for each meter on a city tab
+def meter_configs(weather_info):
+    return [
+        ("Temperature", weather_info.temp_fahrenheit, 120, "°F", "danger"),
+        ("Feels Like", weather_info.feels_like_fahrenheit, 120, "°F", "warning"),
+        ("Humidity", weather_info.humidity, 100, "%", "info"),
+        ("Pressure", weather_info.pressure, 1110, "inHg", "success"),
+        ("UV Index", weather_info.uv_index, 11, "", "danger"),
+        ("Cloudiness", weather_info.clouds, 100, "%", "secondary"),
+        ("Wind Speed", weather_info.wind_speed, 30, "mph", "primary"),
+        ("Wind Gust", weather_info.wind_gust, 45, "mph", "primary"),
+        ("Dew Point", weather_info.dew_point, 80, "°F", "info"),
+        ("Visibility", weather_info.visibility, 10, "mi", "success")
+    ]
+
+def current_time_text(weather_info):
+    return f"{weather_info.current_time} ({weather_info.current_date})"
+
+# (label, value) rows of the "Additional Information" box
+def info_rows(weather_info):
+    return [
+        ("Sunrise:", weather_info.sunrise),
+        ("Sunset:", weather_info.sunset),
+        ("Timezone:", weather_info.timezone_name),
+        ("Current Time:", current_time_text(weather_info))
+    ]
+
+# Position of the "Current Time:" row in info_rows
+CURRENT_TIME_ROW = 3
+
+# (day, "high°/low°", icon) for each day in the forecast strip; empty without a forecast
+def forecast_days(weather_info):
+    if weather_info.forecast is None:
+        return []
+    return [(day, f"{high}°/{low}°", icon)
+            for day, high, low, _, icon in weather_info.forecast.daily_summary(FORECAST_DAYS)]
+
+def condition_text(weather_info):
+    return f"{weather_info.condition} ({weather_info.description})"
+
+def location_key(city_name, state_name, country_code):
+    return city_name.strip().lower(), state_name.strip().lower(), country_code.strip().upper()
+
+def tab_title(city_name, state_name, country_code):
+    return f"{city_name.title()}, {state_name.title()}, {country_code.upper()}"
+
+# One notebook tab per city. The tab itself is added to the notebook right away, but
+# its contents (ten Meters, labels and frames) are only built when build() is called,
+# i.e. when the tab is first shown or when the GUI has idle time.
+class CityTab:
+    def __init__(self, notebook, weather_info, city_name, state_name, country_code, position="end"):
+        self.notebook = notebook
+        self.weather_info = weather_info
+        self.key = location_key(city_name, state_name, country_code)
+        self.title = tab_title(city_name, state_name, country_code)
+        self.meters = []
+        self.title_frame = None
+        self.icon_label = None
+        self.city_name_label = None
+        self.condition_label = None
+        self.info_value_labels = []
+        self.forecast_frame = None
+        self.forecast_labels = []  # (day label, icon label, high/low label) per day
+        self.built = False
+        self.build_seconds = 0.0
+
+        # Create a new tab for this city
+        self.frame = ttk.Frame(
+            notebook, 
+            padding=10)
+        
+        notebook.insert(
+            position,
+            self.frame, 
+            text=self.title)
+
+    # Build the tab's widgets once; later calls do nothing
+    def build(self):
+        if self.built:
+            return
+        self.built = True
+        started = time.perf_counter()
+        weather_info = self.weather_info
+
+        # Create header frame with city name and weather icon
+        header_frame = ttk.Frame(self.frame)
+
+        header_frame.pack(
+            fill=tk.X, 
+            pady=5)
+
+        # Add city name and condition
+        self.title_frame = ttk.Frame(header_frame)
+
+        self.title_frame.pack(
+            side=tk.LEFT, 
+            fill=tk.X, 
+            expand=True)
+
+        # Add weather icon, left of the title
+        self._build_icon(weather_info)
+
+        self.city_name_label = ttk.Label(
+            self.title_frame,
+            text=self.title,
+            font=("Helvetica", 18, "bold"),
+            bootstyle="primary"
+        )
+        self.city_name_label.pack(anchor=tk.W)
+
+        self.condition_label = ttk.Label(
+            self.title_frame,
+            text=condition_text(weather_info),
+            font=("Helvetica", 14),
+            bootstyle="secondary"
+        )
+        self.condition_label.pack(anchor=tk.W)
+
+        # Create meter grid
+        meter_frame = ttk.Frame(self.frame)
+        meter_frame.pack(
+            fill=tk.BOTH, 
+            expand=True, 
+            pady=10)
+
+        # Create 2x4 grid of meters
+        for i, (title, value, max_val, unit, style) in enumerate(meter_configs(weather_info)):
+            row = i // 5
+            col = i % 5
+
+            meter = ttkb.Meter(
+                meter_frame,
+                metersize=150,
+                amountused=value,
+                amounttotal=max_val,
+                metertype="semi",
+                stripethickness=8,
+                subtext=title,
+                textright=unit,
+                interactive=False,
+                bootstyle=style
+            )
+
+            meter.grid(
+                row=row, 
+                column=col, 
+                padx=10, 
+                pady=10, 
+                sticky="nsew")
+
+            self.meters.append(meter)  # Keep reference
+
+            # Configure grid weights
+            meter_frame.grid_rowconfigure(
+                row, 
+                weight=1)
+
+            meter_frame.grid_columnconfigure(
+                col, 
+                weight=1)
+
+        # Additional info frame
+        info_frame = ttk.Labelframe(
+            self.frame,
+            text="Additional Information",
+            bootstyle="info"
+        )
+
+        info_frame.pack(
+            fill=tk.BOTH, 
+            pady=5)
+
+        # Create two columns for additional info
+        left_col = ttk.Frame(info_frame)
+
+        left_col.pack(
+            side=tk.LEFT, 
+            fill=tk.BOTH, 
+            expand=True, 
+            padx=10, 
+            pady=5)
+
+        right_col = ttk.Frame(info_frame)
+
+        right_col.pack(
+            side=tk.LEFT, 
+            fill=tk.BOTH, 
+            expand=True, 
+            padx=10, 
+            pady=5)
+
+        # Add info labels
+        for i, (label, value) in enumerate(info_rows(weather_info)):
+            col = left_col if i % 2 == 0 else right_col
+            info_row = ttk.Frame(col)
+            info_row.pack(
+                fill=tk.X, 
+                pady=2)
+
+            info_label=ttk.Label(
+                info_row,
+                text=label,
+                bootstyle="primary",
+                font=("Helvetica", 14, "bold")
+            )
+            info_label.pack(side=tk.LEFT)
+
+            value_label=ttk.Label(
+                info_row,
+                text=value,
+                bootstyle="secondary",
+                font=("Helvetica", 13)
+            )
+            self.info_value_labels.append(value_label)
+            value_label.pack(
+                side=tk.LEFT, 
+                padx=5)
+
+        # Daily forecast strip, from the same One Call payload as the meters
+        self._build_forecast(forecast_days(weather_info))
+
+        self.build_seconds = time.perf_counter() - started
+
+    # Create the header's weather icon; stays None if the icon can't be loaded
+    def _build_icon(self, weather_info):
+        try:
+            photo = icon_atlas.get_photo(weather_info.icon, WEATHER_ICON_SIZE)
+
+            self.icon_label = ttk.Label(
+                self.title_frame.master, 
+                image=photo)
+
+            self.icon_label.image = photo  # Keep reference
+
+            self.icon_label.pack(
+                side=tk.LEFT, 
+                padx=10,
+                before=self.title_frame)
+        except Exception as e:
+            self.icon_label = None
+            print(f"Couldn't load weather icon: {e}")
+
+    # (Re)create the forecast strip at the bottom of the tab with one column per day
+    def _build_forecast(self, days):
+        if self.forecast_frame is not None:
+            self.forecast_frame.destroy()
+            self.forecast_frame = None
+        self.forecast_labels = []
+        if not days:
+            return
+
+        self.forecast_frame = ttk.Labelframe(
+            self.frame,
+            text="Forecast",
+            bootstyle="info"
+        )
+
+        self.forecast_frame.pack(
+            fill=tk.BOTH, 
+            pady=5)
+
+        for i, (day, high_low, icon) in enumerate(days):
+            self.forecast_frame.grid_columnconfigure(
+                i, 
+                weight=1)
+
+            day_label = ttk.Label(
+                self.forecast_frame,
+                text=day,
+                bootstyle="primary",
+                font=("Helvetica", 13, "bold")
+            )
+            day_label.grid(row=0, column=i, pady=(5, 0))
+
+            icon_label = ttk.Label(self.forecast_frame)
+            icon_label.grid(row=1, column=i)
+            self._set_forecast_icon(icon_label, icon)
+
+            high_low_label = ttk.Label(
+                self.forecast_frame,
+                text=high_low,
+                bootstyle="secondary",
+                font=("Helvetica", 13)
+            )
+            high_low_label.grid(row=2, column=i, pady=(0, 5))
+
+            self.forecast_labels.append((day_label, icon_label, high_low_label))
+
+    def _set_forecast_icon(self, icon_label, icon):
+        try:
+            photo = icon_atlas.get_photo(icon, FORECAST_ICON_SIZE)
+            icon_label.config(image=photo)
+            icon_label.image = photo  # Keep reference
+        except Exception as e:
+            print(f"Couldn't load weather icon: {e}")
+
+    # Show new data (possibly for a different city) by updating the existing widgets
+    def refresh(self, weather_info, city_name, state_name, country_code):
+        self.weather_info = weather_info
+        self.key = location_key(city_name, state_name, country_code)
+        title = tab_title(city_name, state_name, country_code)
+        if title != self.title:
+            self.title = title
+            self.notebook.tab(self.frame, text=title)
+
+        if not self.built:
+            return  # build() will use the new data
+
+        self.city_name_label.config(text=title)
+        self.condition_label.config(text=condition_text(weather_info))
+
+        if self.icon_label is None:
+            self._build_icon(weather_info)  # The last icon failed to load; try again
+        else:
+            try:
+                photo = icon_atlas.get_photo(weather_info.icon, WEATHER_ICON_SIZE)
+                self.icon_label.config(image=photo)
+                self.icon_label.image = photo
+            except Exception as e:
+                print(f"Couldn't load weather icon: {e}")
+
+        for meter, config in zip(self.meters, meter_configs(weather_info)):
+            meter.amountusedvar.set(config[1])
+
+        for value_label, (label, value) in zip(self.info_value_labels, info_rows(weather_info)):
+            value_label.config(text=value)
+
+        # A different number of days (or no forecast at all) needs a new strip
+        days = forecast_days(weather_info)
+        if len(days) != len(self.forecast_labels):
+            self._build_forecast(days)
+            return
+
+        for (day_label, icon_label, high_low_label), (day, high_low, icon) in zip(
+                self.forecast_labels, days):
+            day_label.config(text=day)
+            high_low_label.config(text=high_low)
+            self._set_forecast_icon(icon_label, icon)
+
+    # Same weather, newer snapshot: only move the "Current Time" label forward
+    def refresh_clock(self, weather_info):
+        self.weather_info = weather_info
+        if self.built and len(self.info_value_labels) > CURRENT_TIME_ROW:
+            self.info_value_labels[CURRENT_TIME_ROW].config(text=current_time_text(weather_info))
+
+    def destroy(self):
+        self.frame.destroy()
+        self.meters.clear()
+        self.info_value_labels.clear()
+        self.forecast_labels.clear()
+
+# Keeps city tabs alive between fetches. Each fetch claims tabs for its locations,
+# reusing the tab of the same city (or any spare tab) and only updating its values;
+# tabs left unclaimed when the fetch ends are destroyed so memory stays flat.
+class CityTabPool:
+    def __init__(self, notebook):
+        self.notebook = notebook
+        self._tabs = {}      # Notebook tab id -> CityTab
+        self._claimed = {}   # Location entry index -> CityTab
+
+    # Start a new fetch: hide every tab until it is claimed again
+    def begin_refresh(self):
+        self._claimed = {}
+        for tab in self._tabs.values():
+            self.notebook.hide(tab.frame)
+
+    # Show weather for the location at entry index, reusing a pooled tab when possible
+    def show(self, index, weather_info, city_name, state_name, country_code):
+        claimed = list(self._claimed.values())
+        spare = [tab for tab in self._tabs.values() if tab not in claimed]
+        key = location_key(city_name, state_name, country_code)
+
+        tab = next((tab for tab in spare if tab.key == key), None)
+        if tab is None and spare:
+            tab = spare[0]
+
+        if tab is not None:
+            tab.refresh(weather_info, city_name, state_name, country_code)
+        else:
+            tab = CityTab(self.notebook, weather_info, city_name, state_name, country_code)
+            self._tabs[str(tab.frame)] = tab
+
+        self._claimed[index] = tab
+
+        # Visible tabs follow the order the locations were entered in
+        for position, entry_index in enumerate(sorted(self._claimed)):
+            frame = self._claimed[entry_index].frame
+            self.notebook.insert(position, frame)
+            self.notebook.tab(frame, state="normal")
+        return tab
+
+    # Finish a fetch: destroy every tab that was not claimed
+    def end_refresh(self):
+        claimed = list(self._claimed.values())
+        for tab_id, tab in list(self._tabs.items()):
+            if tab not in claimed:
+                tab.destroy()
+                del self._tabs[tab_id]
+
+    # The tab currently showing the location at entry index, if any
+    def claimed_tab(self, index):
+        return self._claimed.get(index)
+
+    # Look up the CityTab for a notebook tab id
+    def get(self, tab_id):
+        return self._tabs.get(str(tab_id))
+
+    def __len__(self):
+        return len(self._tabs)
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+from settings import (
+    COUNTRY_CODES_PATH, COUNTRY_CODES_SYNC_PATH,
+    COUNTRY_CODES_COLLECTION, COUNTRY_CODES_VERSION_DOC
+)
+
+# Local country-code index. Codes are served from country_code_data.json (or from the
+# last Firestore sync, if newer), loaded once and shared by every country combobox.
+# Firestore is only consulted by sync_country_codes_in_background, and only re-read
+# when the version stamp document says the collection has changed.
+
+_index = None          # {code: name}
+_codes = None          # Sorted list of codes, shared by all comboboxes
+_version = 0
+_lock = threading.Lock()
+
+def _read_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+# Read a country file: either a plain list of {"code", "name"} (version 0) or
+# {"version": N, "countries": [...]}. Returns (entries, version)
+def read_country_file(path):
+    data = _read_json(path)
+    if isinstance(data, list):
+        return data, 0
+    return data["countries"], data.get("version", 0)
+
+def _set_index(entries, version):
+    global _index, _codes, _version
+    _index = {entry["code"]: entry["name"] for entry in entries}
+    _codes = sorted(_index)
+    _version = version
+
+# Load the bundled index and the synced copy (if any) and keep whichever has the
+# higher version, so an updated bundled file wins over an older sync
+def _load():
+    if _index is not None:
+        return
+
+    with _lock:
+        if _index is not None:
+            return
+
+        bundled = synced = None
+        try:
+            bundled = read_country_file(COUNTRY_CODES_PATH)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading country codes: {e}")
+
+        try:
+            if os.path.exists(COUNTRY_CODES_SYNC_PATH):
+                synced = read_country_file(COUNTRY_CODES_SYNC_PATH)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable country code sync file: {e}")
+
+        candidates = [index for index in (bundled, synced) if index is not None]
+        if candidates:
+            # Ties go to the bundled file, which ships with the app
+            _set_index(*max(candidates, key=lambda index: index[1]))
+        else:
+            _set_index([], 0)
+
+# Return {code: name} for every known country
+def get_country_codes():
+    _load()
+    return _index
+
+# Return the sorted list of country codes used to populate comboboxes
+def get_country_code_list():
+    _load()
+    return _codes
+
+# Compare the Firestore version stamp with the local one and, only if it changed,
+# re-read the countries collection and store it next to the bundled file
+def sync_country_codes():
+    from firebase_config import db  # Only needed when syncing
+
+    _load()
+    try:
+        stamp = db.collection(COUNTRY_CODES_VERSION_DOC[0]).document(COUNTRY_CODES_VERSION_DOC[1]).get()
+        remote_version = (stamp.to_dict() or {}).get("version", 0) if stamp.exists else 0
+        if remote_version <= _version:
+            return False
+
+        entries = [
+            {"code": doc.id, "name": doc.to_dict()["name"]}
+            for doc in db.collection(COUNTRY_CODES_COLLECTION).stream()
+        ]
+        if not entries:
+            return False
+
+        with open(COUNTRY_CODES_SYNC_PATH, "w") as f:
+            json.dump({"version": remote_version, "countries": entries}, f)
+
+        with _lock:
+            _set_index(entries, remote_version)
+
+        print(f"Country codes synced to version {remote_version} ({len(entries)} countries)")
+        return True
+    except Exception as e:
+        print(f"Country code sync failed: {e}")
+        return False
+
+# Run sync_country_codes on a daemon thread so it never delays the UI
+def sync_country_codes_in_background():
+    thread = threading.Thread(
+        target=sync_country_codes,
+        name="country-code-sync",
+        daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,111 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Fetch engine settings
+MAX_WORKERS = 5          # One worker per location (the GUI allows up to 5)
+BATCH_DEADLINE = 30      # Seconds before any still-running location is reported as timed out
+POLL_INTERVAL_MS = 50    # How often the Tk thread drains the result queue
+
+# Runs fetch_func for every location in parallel and posts the results to a queue.
+# Each location is reported exactly once as (index, location, data, error), either
+# with its real result or with a timeout error once the batch deadline has passed.
+class FetchBatch:
+    def __init__(self, locations, fetch_func, max_workers=MAX_WORKERS, deadline=BATCH_DEADLINE):
+        self.locations = list(locations)
+        self.fetch_func = fetch_func
+        self.deadline = deadline
+        self.total = len(self.locations)
+        self.results = queue.Queue()
+        self.started_at = None
+
+        self._max_workers = max(1, min(max_workers, self.total or 1))
+        self._reported = set()
+        self._lock = threading.Lock()
+        self._futures = []
+        self._cancelled = threading.Event()
+
+    # Submit every location to the worker pool and start the deadline watchdog
+    def start(self):
+        self.started_at = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="weather-fetch")
+
+        for index, location in enumerate(self.locations):
+            self._futures.append(executor.submit(self._run, index, location))
+
+        # Let the pool wind down on its own once the submitted work finishes
+        executor.shutdown(wait=False)
+
+        watchdog = threading.Thread(
+            target=self._watch_deadline,
+            name="weather-fetch-deadline",
+            daemon=True)
+        watchdog.start()
+        return self
+
+    # Worker body: never lets an exception escape, always reports a result
+    def _run(self, index, location):
+        if self._cancelled.is_set():
+            return
+        try:
+            data, error = self.fetch_func(*location)
+        except Exception as e:
+            data, error = None, f"Unexpected error: {str(e)}"
+        self._report(index, location, data, error)
+
+    # Report any location that has not finished by the deadline
+    def _watch_deadline(self):
+        wait(self._futures, timeout=self.deadline)
+        for index, (future, location) in enumerate(zip(self._futures, self.locations)):
+            if not future.done():
+                future.cancel()
+                self._report(index, location, None,
+                             f"Request timed out - no response within {self.deadline} seconds")
+
+    def _report(self, index, location, data, error):
+        with self._lock:
+            if index in self._reported or self._cancelled.is_set():
+                return
+            self._reported.add(index)
+            self.results.put((index, location, data, error))
+
+    # Abort the batch: queued locations never start and in-flight results are dropped
+    def cancel(self):
+        self._cancelled.set()
+        for future in self._futures:
+            future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    # Return all results that have arrived so far without blocking
+    def drain(self):
+        items = []
+        while True:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                return items
+
+    # Number of locations reported so far
+    @property
+    def completed(self):
+        with self._lock:
+            return len(self._reported)
+
+    # True once every location has been reported or the batch was cancelled
+    @property
+    def done(self):
+        with self._lock:
+            return self._cancelled.is_set() or len(self._reported) == self.total
+
+    # Seconds since the batch was started
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return time.monotonic() - self.started_at
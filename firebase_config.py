@@ -1,19 +1,91 @@
-import firebase_admin
-from firebase_admin import credentials, auth, firestore, storage
 import os
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize Firebase Admin SDK
-key_path = os.getenv("FIREBASE_KEY_PATH")
-cred = credentials.Certificate(key_path)
-firebase_admin.initialize_app(cred, {
-    'storageBucket': os.getenv("FIREBASE_STORAGE_BUCKET")
-})
+# Firebase is initialized on first use instead of at import time. Importing the
+# Admin SDK's Firestore and Storage modules pulls in gRPC and the Google Cloud
+# clients, which used to delay the login window. db, bucket and auth below are
+# stand-ins that set everything up the first time one of their attributes is used;
+# warm_up_in_background() does the same on a worker thread ahead of time.
 
-# Initialize Firestore reference
-db = firestore.client()
+_app = None
+_app_lock = threading.Lock()
 
-bucket = storage.bucket()
+# Initialize the Firebase Admin SDK once and return the default app
+def ensure_app():
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                import firebase_admin
+                from firebase_admin import credentials
+
+                # Initialize Firebase Admin SDK
+                key_path = os.getenv("FIREBASE_KEY_PATH")
+                cred = credentials.Certificate(key_path)
+                _app = firebase_admin.initialize_app(cred, {
+                    'storageBucket': os.getenv("FIREBASE_STORAGE_BUCKET")
+                })
+    return _app
+
+def _create_db():
+    ensure_app()
+    from firebase_admin import firestore
+    return firestore.client()
+
+def _create_bucket():
+    ensure_app()
+    from firebase_admin import storage
+    return storage.bucket()
+
+def _load_auth():
+    ensure_app()
+    from firebase_admin import auth
+    return auth
+
+# Builds its target with factory() on first attribute access and forwards to it
+class LazyProxy:
+    def __init__(self, factory):
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._factory()
+        return self._target
+
+    @property
+    def ready(self):
+        return self._target is not None
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+# Firestore client, Storage bucket and firebase_admin.auth, created on first use
+db = LazyProxy(_create_db)
+bucket = LazyProxy(_create_bucket)
+auth = LazyProxy(_load_auth)
+
+# Create the Firestore client (the slow one) and load auth ahead of first use.
+# Storage stays lazy; only avatars use it.
+def warm_up():
+    db.resolve()
+    auth.resolve()
+
+# Same as warm_up(), on a background thread
+def warm_up_in_background():
+    def run():
+        try:
+            warm_up()
+        except Exception as e:
+            # The first real call will raise again and be reported where it happens
+            print(f"Firebase warm-up failed: {e}")
+
+    if not db.ready:
+        threading.Thread(target=run, name="firebase-warm-up", daemon=True).start()
@@ -0,0 +1,98 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from settings import GEOCODE_CACHE_PATH, GEOCODE_CACHE_SIZE
+
+# Persistent city -> coordinates cache. A city's coordinates never change, so once a
+# location has been geocoded it is stored in SQLite and served from an in-memory LRU
+# in front of it, skipping the /geo/1.0/direct round trip on every later lookup.
+class GeocodeCache:
+    def __init__(self, path=GEOCODE_CACHE_PATH, max_entries=GEOCODE_CACHE_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # Normalize a location into the cache key used by both cache layers.
+    # The state only takes part in the geocode query for US locations.
+    @staticmethod
+    def make_key(city_name, state_name, country_code):
+        def clean(value):
+            return " ".join((value or "").split()).lower()
+
+        country = clean(country_code)
+        state = clean(state_name) if country == "us" else ""
+        return clean(city_name), state, country
+
+    # Open the database lazily so importing this module never touches the disk
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocodes ("
+                "city TEXT NOT NULL, state TEXT NOT NULL, country TEXT NOT NULL, "
+                "lat REAL NOT NULL, lon REAL NOT NULL, "
+                "PRIMARY KEY (city, state, country))")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, coords):
+        self._memory[key] = coords
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # Returns (lat, lon) for a location, or None if it has never been geocoded
+    def get(self, city_name, state_name, country_code):
+        key = self.make_key(city_name, state_name, country_code)
+
+        with self._lock:
+            coords = self._memory.get(key)
+            if coords is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return coords
+
+            try:
+                row = self._connection().execute(
+                    "SELECT lat, lon FROM geocodes WHERE city = ? AND state = ? AND country = ?",
+                    key).fetchone()
+            except sqlite3.Error as e:
+                print(f"Geocode cache read failed: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            coords = (row[0], row[1])
+            self._remember(key, coords)
+            self.hits += 1
+            return coords
+
+    # Store the coordinates of a successfully geocoded location
+    def put(self, city_name, state_name, country_code, lat, lon):
+        key = self.make_key(city_name, state_name, country_code)
+
+        with self._lock:
+            self._remember(key, (lat, lon))
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO geocodes (city, state, country, lat, lon) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (*key, lat, lon))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Geocode cache write failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+# Shared instance used by fetch_weather_data
+geocode_cache = GeocodeCache()
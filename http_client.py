@@ -0,0 +1,85 @@
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from settings import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT,
+    HTTP_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_BACKOFF_JITTER
+)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Only idempotent requests are retried. A POST that reached the server (sign-in,
+# password reset email) must not be sent twice just because the reply was a 5xx.
+RETRY_METHODS = frozenset({"GET"})
+
+# Retry policy that adds random jitter on top of the exponential backoff so that
+# parallel workers hitting the same error don't all retry at the same instant
+class JitteredRetry(Retry):
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, HTTP_BACKOFF_JITTER)
+
+# Seconds to wait before retry number `attempt` (0-based) for callers that retry
+# themselves, using the same exponential backoff and jitter as JitteredRetry
+def backoff_seconds(attempt):
+    return HTTP_BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, HTTP_BACKOFF_JITTER)
+
+_sessions = {}  # retry -> session
+_session_lock = threading.Lock()
+
+# Build a session: one keep-alive connection pool per host, bounded in size.
+# With retry=False every call is a single attempt, for callers (the OpenWeatherMap
+# rate limiter) that must see and count each response themselves.
+def _create_session(retry=True):
+    if retry:
+        retry = JitteredRetry(
+            total=HTTP_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False  # Hand the final response back so callers can read its status code
+        )
+    else:
+        retry = 0
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# Return the process-wide pooled session (retrying or single-attempt), creating it on first use
+def get_session(retry=True):
+    session = _sessions.get(retry)
+    if session is None:
+        with _session_lock:
+            session = _sessions.get(retry)
+            if session is None:
+                session = _sessions[retry] = _create_session(retry)
+    return session
+
+# GET with the shared pool and the default timeout
+def get(url, retry=True, **kwargs):
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_session(retry).get(url, **kwargs)
+
+# POST with the shared pool and the default timeout
+def post(url, **kwargs):
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_session().post(url, **kwargs)
+
+# Download a URL and return its raw bytes, raising on HTTP errors
+def get_bytes(url, **kwargs):
+    response = get(url, **kwargs)
+    response.raise_for_status()
+    return response.content
@@ -0,0 +1,82 @@
+import os
+import re
+import threading
+from io import BytesIO
+from PIL import Image
+import http_client
+from settings import WEATHER_ICON_DIR, WEATHER_ICON_SIZES, WEATHER_ICON_URL
+
+# Bundled icon files look like "01d@2x.png"
+ICON_FILE_PATTERN = re.compile(r"^(\d\d[dn])@2x\.png$")
+
+# Atlas of OpenWeatherMap condition icons. The icons bundled in Images/ are loaded
+# once and pre-scaled to every size the GUI uses, so building a tab does no I/O.
+# Unknown codes are downloaded once and added to the atlas.
+class IconAtlas:
+    def __init__(self, icon_dir=WEATHER_ICON_DIR, sizes=WEATHER_ICON_SIZES):
+        self.icon_dir = icon_dir
+        self.sizes = tuple(sizes)
+
+        self._originals = {}   # code -> full-size PIL image
+        self._scaled = {}      # (code, size) -> scaled PIL image
+        self._photos = {}      # (code, size) -> PhotoImage (Tk thread only)
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _add(self, code, image):
+        image = image.convert("RGBA")
+        self._originals[code] = image
+        for size in self.sizes:
+            self._scaled[(code, size)] = image.resize((size, size), Image.LANCZOS)
+
+    # Decode and pre-scale every bundled icon. Safe to call from a worker thread.
+    def load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                for filename in sorted(os.listdir(self.icon_dir)):
+                    match = ICON_FILE_PATTERN.match(filename)
+                    if not match:
+                        continue
+                    with Image.open(os.path.join(self.icon_dir, filename)) as image:
+                        self._add(match.group(1), image)
+            except OSError as e:
+                print(f"Could not load bundled weather icons: {e}")
+            self._loaded = True
+
+    # Return the PIL icon for a code at the given size, downloading unknown codes once
+    def get_image(self, code, size):
+        self.load()
+
+        with self._lock:
+            image = self._scaled.get((code, size))
+            if image is not None:
+                return image
+
+            original = self._originals.get(code)
+            if original is not None:
+                # A size that was not pre-scaled: scale it once and keep it
+                image = original.resize((size, size), Image.LANCZOS)
+                self._scaled[(code, size)] = image
+                return image
+
+        raw_data = http_client.get_bytes(WEATHER_ICON_URL.format(icon=code))
+        with Image.open(BytesIO(raw_data)) as image:
+            with self._lock:
+                self._add(code, image)
+                if (code, size) not in self._scaled:
+                    self._scaled[(code, size)] = self._originals[code].resize((size, size), Image.LANCZOS)
+                return self._scaled[(code, size)]
+
+    # Return a cached PhotoImage for a code and size. Must be called on the Tk thread.
+    def get_photo(self, code, size):
+        photo = self._photos.get((code, size))
+        if photo is None:
+            from PIL import ImageTk  # Imports tkinter, so only load it for the GUI
+            photo = ImageTk.PhotoImage(self.get_image(code, size))
+            self._photos[(code, size)] = photo
+        return photo
+
+# Shared atlas used by the GUI
+icon_atlas = IconAtlas()
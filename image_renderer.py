@@ -0,0 +1,124 @@
+import os
+from datetime import date
+from PIL import ImageDraw, ImageFont
+from asset_cache import get_template_image, get_font
+from settings import TEMPLATES, DEFAULT_FONT, TEXT_COLOR, TEXT_COLOR_DARK, FORECAST_DAYS
+
+# Rendering of the post/story export images.
+# Kept free of tkinter so the GUI and the headless batch generator can both use it.
+
+# Date line printed on every template, e.g. "Friday - May 30, 2025"
+def template_date_text():
+    return date.today().strftime("%A - %B %d, %Y")
+
+# Load the three template fonts, falling back to Pillow's default font
+def load_template_fonts(template_type):
+    font_sizes = TEMPLATES[template_type]["font_sizes"]
+    try:
+        font_large = get_font(DEFAULT_FONT, font_sizes["large"])
+        font_medium = get_font(DEFAULT_FONT, font_sizes["medium"])
+        font_title = get_font(DEFAULT_FONT, font_sizes["title"])
+    except OSError:
+        font_large = ImageFont.load_default()
+        font_medium = ImageFont.load_default()
+        font_title = ImageFont.load_default()
+    return font_large, font_medium, font_title
+
+# Daily high/low line for the templates, e.g. "Sat 72°/58°   Sun 70°/55°   Mon 68°/50°"
+def forecast_text(forecast, days=FORECAST_DAYS):
+    return "   ".join(f"{day} {high}°/{low}°" for day, high, low, _, _ in forecast.daily_summary(days))
+
+# Font for the forecast line, or None if the template has no forecast slot
+def load_forecast_font(template_type):
+    font_sizes = TEMPLATES[template_type]["font_sizes"]
+    if "small" not in font_sizes:
+        return None
+    try:
+        return get_font(DEFAULT_FONT, font_sizes["small"])
+    except OSError:
+        return ImageFont.load_default()
+
+# Draw the weather for up to five locations onto the selected template and return the image
+def render_weather_image(weather_list, template_type="post"):
+    template = TEMPLATES[template_type]
+    image = get_template_image(template_type)
+    draw = ImageDraw.Draw(image)
+
+    font_large, font_medium, font_title = load_template_fonts(template_type)
+    font_small = load_forecast_font(template_type)
+
+    # Add date
+    draw.text(
+        template["date_position"],
+        template_date_text(),
+        fill=TEXT_COLOR,
+        font=font_medium
+    )
+
+    # App Title
+    if weather_list:
+        draw.text(
+            template["title_position"],
+            "Weather Forecast Generator",
+            fill=TEXT_COLOR,
+            font=font_title,
+            align="center"
+        )
+
+    # Add weather for each location
+    for i, weather in enumerate(weather_list):
+        if i >= len(template["city_position"]):
+            break
+
+        country_code = weather.country.upper()
+
+        # City name
+        city_text = f"{weather.city.title()}, {country_code}"
+        draw.text(
+            template["city_position"][i],
+            city_text,
+            fill=TEXT_COLOR_DARK,
+            font=font_large
+        )
+
+        # Temperature
+        temp_text = f"{weather.temp_fahrenheit}°F"
+        draw.text(
+            template["temp_position"][i],
+            temp_text,
+            fill=TEXT_COLOR,
+            font=font_large
+        )
+
+        # Humidity (optional)
+        if "humidity_position" in template:
+            hum_text = f"{weather.humidity}%"
+            draw.text(
+                template["humidity_position"][i],
+                hum_text,
+                fill=TEXT_COLOR,
+                font=font_large
+            )
+
+        # Multi-day forecast (optional), from the payload the snapshot was built from
+        if "forecast_position" in template and font_small and weather.forecast:
+            draw.text(
+                template["forecast_position"][i],
+                forecast_text(weather.forecast),
+                fill=TEXT_COLOR_DARK,
+                font=font_small
+            )
+
+    return image
+
+# Save a rendered image as PNG and, optionally, PDF. Returns (png_path, pdf_path)
+def save_weather_image(image, save_dir, filename, save_pdf=True):
+    png_path = os.path.join(save_dir, f"{filename}.png")
+    image.save(png_path)
+
+    pdf_path = None
+    if save_pdf:
+        pdf_path = os.path.join(save_dir, f"{filename}.pdf")
+        image.convert("RGB").save(pdf_path)
+
+    return png_path, pdf_path
@@ -1,12 +1,17 @@
-import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from ttkbootstrap import Style, Window
-from firebase_admin import auth
-from firebase_config import db
-from auth_controller import create_user, verify_password
+from firebase_config import auth, db, warm_up_in_background
+from auth_controller import create_user, login, restore_session
+from asset_cache import get_logo
+from fetch_engine import POLL_INTERVAL_MS
+from preloader import start_preloading
+from session_cache import load_session
+from settings import FIREBASE_WARM_UP, PRELOAD_ON_LOGIN, REMEMBER_SESSION
 import re
-from PIL import Image, ImageTk
+from PIL import ImageTk
 
 image_references = {}
 
@@ -14,6 +19,7 @@ class LoginScreen:
     def __init__(self, master, on_login_success):
         self.master = master
         self.on_login_success = on_login_success
+        self.login_in_progress = False
         self.style = Style(theme='pulse')
         
         # Main container frame
@@ -28,20 +34,15 @@ class LoginScreen:
         
         # App logo
         try:
-            icon_path = "Images/FelipeWeatherAppLogo.png"
-            if os.path.exists(icon_path):
-                img = Image.open(icon_path)
-                img = img.resize((32, 32), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                image_references['icon'] = photo  # Prevent GC
-                self.master.iconphoto(True, photo)
+            photo = ImageTk.PhotoImage(get_logo(32))
+            image_references['icon'] = photo  # Prevent GC
+            self.master.iconphoto(True, photo)
         except Exception as e:
             print(f"Could not load window icon: {e}")
 
 
         try:
-            img = Image.open("Images/FelipeWeatherAppLogo.png").resize((150, 150))
-            self.logo = ImageTk.PhotoImage(img)
+            self.logo = ImageTk.PhotoImage(get_logo(150))
 
             logo_label=ttk.Label(
                 self.main_frame, 
@@ -108,6 +109,19 @@ class LoginScreen:
             text="Register")
         
         self._setup_register_form()
+
+        # Once the window is on screen, warm the main window's assets (and Firebase)
+        # in the background so they are ready by the time the user logs in
+        if PRELOAD_ON_LOGIN:
+            self.master.after_idle(start_preloading)
+        elif FIREBASE_WARM_UP:
+            self.master.after_idle(warm_up_in_background)
+
+        # A returning user's session is restored with a token refresh instead of a sign-in
+        saved_session = load_session() if REMEMBER_SESSION else None
+        if saved_session:
+            self._set_login_busy(True, "Restoring session...")
+            self._run_in_background(lambda: restore_session(saved_session), self._on_session_restored)
     
     def _setup_login_form(self):
         # Email
@@ -160,14 +174,14 @@ class LoginScreen:
             padx=15)
         
         # Login Button
-        login_btn = ttk.Button(
+        self.login_btn = ttk.Button(
             self.login_frame, 
             text="Login", 
             command=self._handle_login,
             bootstyle="success"
         )
 
-        login_btn.grid(
+        self.login_btn.grid(
             row=2, 
             column=0, 
             columnspan=3, 
@@ -362,43 +376,80 @@ class LoginScreen:
         email = self.login_email.get().strip()
         password = self.login_password.get().strip()
         
+        if self.login_in_progress:
+            return
+
         if not email or not password:
             messagebox.showerror("Error", "Please enter both email and password")
             return
         
-        try:
-            uid, error_msg = verify_password(email, password)
-            
-            if error_msg:
-                # Handle specific Firebase errors
-                if "INVALID_LOGIN_CREDENTIALS" in error_msg:
-                    error_msg = "Invalid email or password"
-                elif "TOO_MANY_ATTEMPTS" in error_msg:
-                    error_msg = "Too many attempts. Try again later"
-                    
-                messagebox.showerror("Login Error", error_msg)
-                return
-                
-            # Get user data from Firestore - CORRECTED VERSION
-            user_ref = db.collection('users').document(uid)
-            user_doc = user_ref.get()
-            
-            if user_doc.exists:
-                user_data = user_doc.to_dict()
-                 # Construct full name from first and last name
-                full_name = ""
-                if 'full_name' in user_data:
-                    first_name = user_data['full_name'].get('first_name', '')
-                    last_name = user_data['full_name'].get('last_name', '')
-                    full_name = f"{first_name} {last_name}".strip()
-                
-                messagebox.showinfo("Success", f"Welcome back: \n{full_name or 'User'}!")
-                self.on_login_success(uid, user_data)
-            else:
-                messagebox.showerror("Error", "User data not found")
+        # Sign-in and the profile read run on a worker thread so the window stays responsive
+        self._set_login_busy(True, "Signing in...")
+        self._run_in_background(lambda: login(email, password), self._on_login_result)
+
+    def _on_login_result(self, result, exception):
+        self._set_login_busy(False)
+        if exception is not None:
+            messagebox.showerror("Error", f"Login failed: {str(exception)}")
+            return
+
+        session, error_msg = result
+        if error_msg:
+            # Handle specific Firebase errors
+            if "INVALID_LOGIN_CREDENTIALS" in error_msg:
+                error_msg = "Invalid email or password"
+            elif "TOO_MANY_ATTEMPTS" in error_msg:
+                error_msg = "Too many attempts. Try again later"
                 
-        except Exception as e:
-            messagebox.showerror("Error", f"Login failed: {str(e)}")
+            messagebox.showerror("Login Error", error_msg)
+            return
+
+        user_data = session["user_data"]
+        # Construct full name from first and last name
+        full_name = ""
+        if 'full_name' in user_data:
+            first_name = user_data['full_name'].get('first_name', '')
+            last_name = user_data['full_name'].get('last_name', '')
+            full_name = f"{first_name} {last_name}".strip()
+        
+        messagebox.showinfo("Success", f"Welcome back: \n{full_name or 'User'}!")
+        self.on_login_success(session["uid"], user_data)
+
+    # Saved session restored: go straight to the main window. Otherwise show the login form.
+    def _on_session_restored(self, result, exception):
+        self._set_login_busy(False)
+        session, error_msg = result if exception is None else (None, str(exception))
+        if error_msg:
+            print(f"Could not restore saved session: {error_msg}")
+            return
+
+        print(f"DEBUG::: [SESSION RESTORED] UID {session['uid']}")
+        self.on_login_success(session["uid"], session["user_data"])
+
+    def _set_login_busy(self, busy, text="Login"):
+        self.login_in_progress = busy
+        self.login_btn.config(text=text, state="disabled" if busy else "normal")
+
+    # Run func() on a worker thread and hand (result, exception) to on_done on the Tk thread
+    def _run_in_background(self, func, on_done):
+        results = queue.Queue(maxsize=1)
+
+        def worker():
+            try:
+                results.put((func(), None))
+            except Exception as e:
+                results.put((None, e))
+
+        threading.Thread(target=worker, name="login", daemon=True).start()
+        self.master.after(POLL_INTERVAL_MS, self._poll_background, results, on_done)
+
+    def _poll_background(self, results, on_done):
+        try:
+            result, exception = results.get_nowait()
+        except queue.Empty:
+            self.master.after(POLL_INTERVAL_MS, self._poll_background, results, on_done)
+            return
+        on_done(result, exception)
     
     # Handles password reset
     def _handle_password_reset(self):
@@ -428,17 +479,14 @@ class LoginScreen:
 
         # App logo
         try:
-            logo_path = "Images/FelipeWeatherAppLogo.png"
-            if os.path.exists(logo_path):
-                img = Image.open(logo_path).resize((75, 75))
-                logo_photo = ImageTk.PhotoImage(img)
-                image_references['reset_logo'] = logo_photo  # Prevent GC
-
-                logo_label = ttk.Label(
-                    main_frame, 
-                    image=logo_photo)
-                
-                logo_label.pack(pady=10)
+            logo_photo = ImageTk.PhotoImage(get_logo(75))
+            image_references['reset_logo'] = logo_photo  # Prevent GC
+
+            logo_label = ttk.Label(
+                main_frame, 
+                image=logo_photo)
+            
+            logo_label.pack(pady=10)
         except Exception as e:
             print(f"Could not load logo: {e}")
 
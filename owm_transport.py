@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+import http_client
+
+# Record/replay transport for OpenWeatherMap, so fetch_weather_data and get_weather can
+# run (and be benchmarked) without the live API or a real API_KEY.
+#
+#   Record:  OWM_RECORD_DIR=fixtures python weather_api.py
+#            Every geocode and One Call response is saved to a fixture file.
+#   Replay:  OWM_REPLAY_DIR=fixtures python batch_generate.py jobs.json
+#            Requests are answered from the fixtures by an in-process adapter.
+#   Serve:   python owm_transport.py serve fixtures --port 8765 --latency-ms 80
+#            then OWM_BASE_URL=http://127.0.0.1:8765 for any client.
+#
+# Replay and serve both accept a latency (plus jitter) and an error rate with the
+# status to inject, e.g. 429 to exercise the rate limiter or 503 for outages.
+
+# Query parameters that don't identify the response
+IGNORED_PARAMS = ("appid",)
+
+# Stand-in API key while replaying: requests never leave the process and the key is
+# dropped from fixture lookups, so no real key is needed
+REPLAY_API_KEY = "replay"
+
+_replaying = False
+
+# True once enable_replay() has mounted the replay adapter
+def replay_enabled():
+    return _replaying
+
+# Canonical form of a request: path plus sorted query, without the host or API key
+def canonical_request(url):
+    parts = urlsplit(url)
+    query = sorted((key, value) for key, value in parse_qsl(parts.query) if key not in IGNORED_PARAMS)
+    return f"{parts.path}?{urlencode(query)}"
+
+# Directory of recorded responses, one JSON file per canonical request
+class FixtureStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def fixture_path(self, url):
+        canonical = canonical_request(url)
+        kind = "geocode" if "/geo/" in canonical else "onecall"
+        digest = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.path, f"{kind}_{digest}.json")
+
+    def save(self, url, status_code, body):
+        fixture = {"request": canonical_request(url), "status": status_code,
+                   "body": body.decode("utf-8")}
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self.fixture_path(url), "w") as f:
+                json.dump(fixture, f)
+
+    # Returns {"request", "status", "body"} or None if this request was never recorded
+    def load(self, url):
+        try:
+            with open(self.fixture_path(url), "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def __len__(self):
+        try:
+            return sum(1 for name in os.listdir(self.path) if name.endswith(".json"))
+        except OSError:
+            return 0
+
+# Latency and error injection shared by the replay adapter and the stand-in server
+class ReplayPolicy:
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, error_status=503, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # Sleep for the simulated round trip, then return (status, body bytes) for the request
+    def respond(self, store, url):
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            inject_error = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if inject_error:
+            body = {"cod": self.error_status, "message": "Injected error"}
+            return self.error_status, json.dumps(body).encode("utf-8")
+
+        fixture = store.load(url)
+        if fixture is None:
+            body = {"cod": 404, "message": f"No fixture for {canonical_request(url)}"}
+            return 404, json.dumps(body).encode("utf-8")
+        return fixture["status"], fixture["body"].encode("utf-8")
+
+# Wraps the session's real adapter and saves every response it returns
+class RecordingAdapter(BaseAdapter):
+    def __init__(self, inner, store):
+        super().__init__()
+        self.inner = inner
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        if response.status_code == 200:
+            self.store.save(request.url, response.status_code, response.content)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+# Answers requests from the fixture store without touching the network
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, store, policy=None):
+        super().__init__()
+        self.store = store
+        self.policy = policy or ReplayPolicy()
+
+    def send(self, request, **kwargs):
+        status_code, body = self.policy.respond(self.store, request.url)
+
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = body
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json; charset=utf-8"})
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+# Record every OpenWeatherMap response made through http_client into fixture_dir.
+# OpenWeatherMap calls use the single-attempt session (weather_service.owm_get retries
+# itself), so that is where the adapters go.
+def enable_recording(fixture_dir, base_url):
+    session = http_client.get_session(retry=False)
+    adapter = RecordingAdapter(session.get_adapter(base_url), FixtureStore(fixture_dir))
+    session.mount(base_url, adapter)
+    print(f"Recording OpenWeatherMap responses to {fixture_dir}")
+    return adapter
+
+# Answer every OpenWeatherMap request made through http_client from fixture_dir
+def enable_replay(fixture_dir, base_url, policy=None):
+    global _replaying
+    store = FixtureStore(fixture_dir)
+    adapter = ReplayAdapter(store, policy)
+    http_client.get_session(retry=False).mount(base_url, adapter)
+    _replaying = True
+    print(f"Replaying OpenWeatherMap responses from {fixture_dir} ({len(store)} fixtures)")
+    return adapter
+
+# Switch recording or replay on from the environment:
+# OWM_RECORD_DIR, or OWM_REPLAY_DIR with OWM_REPLAY_LATENCY_MS, OWM_REPLAY_JITTER_MS,
+# OWM_REPLAY_ERROR_RATE and OWM_REPLAY_ERROR_STATUS
+def configure_from_env():
+    from weather_service import owm_base_url
+
+    if os.getenv("OWM_REPLAY_DIR"):
+        policy = ReplayPolicy(
+            latency_ms=float(os.getenv("OWM_REPLAY_LATENCY_MS", 0)),
+            jitter_ms=float(os.getenv("OWM_REPLAY_JITTER_MS", 0)),
+            error_rate=float(os.getenv("OWM_REPLAY_ERROR_RATE", 0)),
+            error_status=int(os.getenv("OWM_REPLAY_ERROR_STATUS", 503)))
+        return enable_replay(os.getenv("OWM_REPLAY_DIR"), owm_base_url(), policy)
+    if os.getenv("OWM_RECORD_DIR"):
+        return enable_recording(os.getenv("OWM_RECORD_DIR"), owm_base_url())
+    return None
+
+# Local stand-in for api.openweathermap.org serving the fixtures over HTTP
+def create_server(fixture_dir, host="127.0.0.1", port=8765, policy=None):
+    store = FixtureStore(fixture_dir)
+    policy = policy or ReplayPolicy()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status_code, body = policy.respond(store, self.path)
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark output readable
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded OpenWeatherMap fixtures locally")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="Run the local stand-in server")
+    serve.add_argument("fixture_dir")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency-ms", type=float, default=0)
+    serve.add_argument("--jitter-ms", type=float, default=0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args(argv)
+
+    policy = ReplayPolicy(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status)
+    server = create_server(args.fixture_dir, args.host, args.port, policy)
+    print(f"Serving {len(FixtureStore(args.fixture_dir))} fixtures on http://{args.host}:{args.port} "
+          f"(set OWM_BASE_URL to this address)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import threading
+import time
+import asset_cache
+import firebase_config
+from country_codes import get_country_code_list
+from icon_atlas import icon_atlas
+from settings import FIREBASE_WARM_UP
+
+# Warms everything the main window needs while the user is still typing their
+# password: template PNGs, fonts, the logo sizes, the weather icon atlas, the country
+# list and the Firestore client. Each task runs on its own daemon thread and only does
+# PIL / file / network work; PhotoImages are still created on the Tk thread, from the
+# already decoded and scaled images. A task that fails is just recorded, since the
+# main window loads the same thing on demand and reports the error there.
+class Preloader:
+    def __init__(self, tasks):
+        self.tasks = dict(tasks)  # name -> function
+        self.started_at = None
+        self.durations = {}  # name -> seconds
+        self.errors = {}     # name -> message
+
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _run(self, name, func):
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            with self._lock:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+            print(f"Preloading {name} failed: {e}")
+        finally:
+            with self._lock:
+                self.durations[name] = time.perf_counter() - started
+
+    # Start every task once; later calls do nothing
+    def start(self):
+        with self._lock:
+            if self.started_at is not None:
+                return self
+            self.started_at = time.perf_counter()
+            for name, func in self.tasks.items():
+                thread = threading.Thread(target=self._run, args=(name, func),
+                                          name=f"preload-{name}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return self
+
+    @property
+    def done(self):
+        return self.started_at is not None and not any(t.is_alive() for t in self._threads)
+
+    # Block until every task has finished (or timeout seconds have passed)
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for thread in list(self._threads):
+            thread.join(None if deadline is None else max(0, deadline - time.perf_counter()))
+        return self.done
+
+    def stats(self):
+        with self._lock:
+            return {
+                "done": self.done,
+                "pending": [name for name in self.tasks if name not in self.durations],
+                "ms": {name: round(seconds * 1000, 1) for name, seconds in self.durations.items()},
+                "errors": dict(self.errors)
+            }
+
+def _preload_tasks():
+    tasks = {
+        "templates": asset_cache.preload_templates,
+        "fonts": asset_cache.preload_fonts,
+        "logos": asset_cache.preload_logos,
+        "icons": icon_atlas.load,
+        "country_codes": get_country_code_list
+    }
+    if FIREBASE_WARM_UP:
+        tasks["firestore"] = firebase_config.warm_up
+    return tasks
+
+# Shared instance, started by the login screen
+preloader = Preloader(_preload_tasks())
+
+def start_preloading():
+    return preloader.start()
@@ -0,0 +1,194 @@
+import copy
+import random
+import threading
+from concurrent.futures import Future
+from io import BytesIO
+from PIL import Image, ImageOps
+import http_client
+from firebase_config import db
+from session_cache import load_session, save_session
+from settings import PROFILE_IMAGE_SIZE, PROFILE_PLACEHOLDER_PATH, REMEMBER_SESSION
+from single_flight import SingleFlight
+
+# In-memory copy of the signed-in user's /users/{uid} document. It is seeded with the
+# profile read at login, then kept current by a Firestore on_snapshot listener, so the
+# profile windows render from memory instead of reading the document on every open.
+#
+# Writes are optimistic: update() applies the change locally right away and sends it
+# to Firestore on a worker thread. Until the write is acknowledged, snapshots are
+# shown with the change still applied on top; if it fails, the change is dropped
+# and the last server copy shows through again.
+#
+# Avatars are downloaded once per URL and kept as resized PIL images.
+class ProfileStore:
+    def __init__(self):
+        self.uid = None
+        self.snapshots = 0
+        self.reads = 0
+        self.writes = 0
+
+        self._server_data = None  # Last copy from Firestore (or from login)
+        self._pending = []        # Optimistic updates not yet acknowledged
+        self._watch = None
+        self._avatars = {}        # url -> PIL image
+        self._avatar_flight = SingleFlight("avatar")
+        self._lock = threading.Lock()
+
+    # Start tracking uid's profile. user_data is what the login already read, if anything.
+    def start(self, uid, user_data=None):
+        self.stop()
+        with self._lock:
+            self.uid = uid
+            self._server_data = copy.deepcopy(user_data) if user_data else None
+        # Creating the listener resolves the Firestore client, which can be slow
+        threading.Thread(target=self._listen, args=(uid,), name="profile-listener", daemon=True).start()
+
+    def _listen(self, uid):
+        try:
+            watch = db.collection("users").document(uid).on_snapshot(self._on_snapshot)
+        except Exception as e:
+            print(f"Profile listener could not start: {e}")
+            return
+        with self._lock:
+            if self.uid != uid:  # Logged out (or switched user) in the meantime
+                watch.unsubscribe()
+                return
+            self._watch = watch
+
+    # Called on Firestore's listener thread whenever the document changes
+    def _on_snapshot(self, doc_snapshots, changes, read_time):
+        for snapshot in doc_snapshots:
+            if not snapshot.exists:
+                continue
+            data = snapshot.to_dict()
+            with self._lock:
+                if snapshot.id != self.uid:
+                    return
+                self.snapshots += 1
+                old_url = (self._server_data or {}).get("profile_image_url")
+                self._server_data = data
+            self._save_to_session(snapshot.id, data)
+
+            url = data.get("profile_image_url")
+            if url and url != old_url:
+                threading.Thread(target=self.avatar, args=(url,), name="profile-avatar", daemon=True).start()
+
+    # Keep the profile saved with the session (see session_cache.py) current as well
+    def _save_to_session(self, uid, data):
+        if not REMEMBER_SESSION:
+            return
+        session = load_session()
+        if session and session["uid"] == uid:
+            save_session(uid, session["refresh_token"], data)
+
+    # Stop listening and forget the profile and avatars (logout)
+    def stop(self):
+        with self._lock:
+            watch, self._watch = self._watch, None
+            self.uid = None
+            self._server_data = None
+            self._pending = []
+            self._avatars.clear()
+        if watch is not None:
+            try:
+                watch.unsubscribe()
+            except Exception as e:
+                print(f"Profile listener could not stop: {e}")
+
+    # Returns a copy of the profile, reading the document only if nothing has arrived yet
+    def get(self):
+        with self._lock:
+            uid, loaded = self.uid, self._server_data is not None
+        if not loaded and uid:
+            doc = db.collection("users").document(uid).get()
+            with self._lock:
+                self.reads += 1
+                if self.uid == uid and self._server_data is None:
+                    self._server_data = doc.to_dict() if doc.exists else None
+
+        with self._lock:
+            if self._server_data is None:
+                return None
+            data = copy.deepcopy(self._server_data)
+            for updates in self._pending:
+                data.update(copy.deepcopy(updates))
+            return data
+
+    # Apply top-level field updates locally now and write them in the background.
+    # Returns a Future that fails if Firestore rejects the write.
+    def update(self, updates):
+        future = Future()
+        with self._lock:
+            uid = self.uid
+            self._pending.append(updates)
+
+        def write():
+            try:
+                db.collection("users").document(uid).update(updates)
+                with self._lock:
+                    self.writes += 1
+                    if self._server_data is not None:
+                        self._server_data.update(copy.deepcopy(updates))
+                future.set_result(True)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._pending = [pending for pending in self._pending if pending is not updates]
+
+        threading.Thread(target=write, name="profile-write", daemon=True).start()
+        return future
+
+    # Return the avatar for url (or the placeholder) as a PROFILE_IMAGE_SIZE PIL image
+    def avatar(self, url):
+        if not url:
+            return self._placeholder()
+        with self._lock:
+            image = self._avatars.get(url)
+        if image is not None:
+            return image
+        try:
+            image = self._avatar_flight.do(url, lambda: self._download_avatar(url))
+        except Exception as e:
+            print("Error loading image from URL:", e)
+            return self._placeholder()
+        with self._lock:
+            self._avatars[url] = image
+        return image
+
+    # Store an avatar we already have locally (a fresh upload) so it is never downloaded
+    def set_avatar(self, url, image):
+        with self._lock:
+            self._avatars[url] = image
+
+    def _download_avatar(self, url):
+        # The blob is overwritten in place, so skip any cached copy of the old image
+        raw_data = http_client.get_bytes(url, params={"cache_buster": random.randint(1, 999999)})
+        image = Image.open(BytesIO(raw_data))
+        image = ImageOps.exif_transpose(image)  # Handle orientation
+        return image.resize((PROFILE_IMAGE_SIZE, PROFILE_IMAGE_SIZE), Image.LANCZOS)
+
+    def _placeholder(self):
+        with self._lock:
+            image = self._avatars.get(None)
+        if image is None:
+            with Image.open(PROFILE_PLACEHOLDER_PATH) as placeholder:
+                image = placeholder.resize((PROFILE_IMAGE_SIZE, PROFILE_IMAGE_SIZE), Image.LANCZOS)
+            with self._lock:
+                self._avatars[None] = image
+        return image
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": self._server_data is not None,
+                "listening": self._watch is not None,
+                "snapshots": self.snapshots,
+                "reads": self.reads,
+                "writes": self.writes,
+                "pending_writes": len(self._pending),
+                "avatars": len(self._avatars)
+            }
+
+# Shared instance for the signed-in user
+profile_store = ProfileStore()
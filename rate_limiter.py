@@ -0,0 +1,183 @@
+import atexit
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from settings import (
+    OWM_CALLS_PER_MINUTE, OWM_CALLS_PER_DAY, OWM_USAGE_PATH,
+    OWM_MIN_RATE_FACTOR, OWM_THROTTLE_PAUSE, OWM_MAX_WAIT
+)
+
+# Request priorities: lower numbers are served first
+PRIORITY_INTERACTIVE = 0  # GUI fetches the user is waiting on
+PRIORITY_BATCH = 1  # Headless batch jobs
+PRIORITY_BACKGROUND = 2  # Auto-refresh and other work nobody is waiting on
+
+# Seconds between writes of the daily usage counter
+USAGE_FLUSH_INTERVAL = 5
+
+class RateLimitExceeded(Exception):
+    pass
+
+# Client-side quota governor shared by every OpenWeatherMap call.
+# A token bucket enforces the per-minute budget (bursts up to the full minute's worth)
+# and a counter persisted to disk enforces the per-day budget across runs. Callers
+# wait in priority order, so an interactive GUI fetch jumps ahead of queued batch
+# work. A 429 halves the refill rate and pauses the bucket; every successful call
+# then wins a little of the rate back.
+class RateLimiter:
+    def __init__(self, per_minute=OWM_CALLS_PER_MINUTE, per_day=OWM_CALLS_PER_DAY,
+                 usage_path=OWM_USAGE_PATH):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.usage_path = usage_path
+
+        self.granted = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+        self._tokens = float(per_minute)
+        self._refilled_at = time.monotonic()
+        self._rate_factor = 1.0
+        self._paused_until = 0.0
+        self._waiters = []  # Heap of (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+        self._usage_date = None
+        self._daily_used = 0
+        self._usage_dirty = False
+        self._flushed_at = 0.0
+        self._load_usage()
+        atexit.register(self.flush)
+
+    # Daily quotas reset at midnight UTC
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _load_usage(self):
+        self._usage_date = self._today()
+        try:
+            with open(self.usage_path, "r") as f:
+                usage = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if usage.get("date") == self._usage_date:
+            self._daily_used = int(usage.get("calls", 0))
+
+    # Write the daily counter to disk; called periodically and at exit
+    def flush(self):
+        with self._cond:
+            if not self._usage_dirty:
+                return
+            usage = {"date": self._usage_date, "calls": self._daily_used}
+            self._usage_dirty = False
+            self._flushed_at = time.monotonic()
+        try:
+            tmp_path = f"{self.usage_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(usage, f)
+            os.replace(tmp_path, self.usage_path)
+        except OSError as e:
+            print(f"Could not save OpenWeatherMap usage counter: {e}")
+
+    def _refill(self, now):
+        rate = self.per_minute / 60 * self._rate_factor
+        self._tokens = min(float(self.per_minute), self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+
+    # Seconds until the ticket at the head of the queue may take a token (0 = now)
+    def _wait_time(self, now):
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0
+        return (1 - self._tokens) / (self.per_minute / 60 * self._rate_factor)
+
+    # Block until a request may be sent. daily=False for calls outside the daily
+    # One Call allowance (e.g. geocoding). Raises RateLimitExceeded when the daily
+    # budget is spent or no token frees up within max_wait seconds. deadline is an
+    # optional time.monotonic() value (e.g. the end of a batch) after which no token
+    # is handed out, so work nobody is waiting for anymore never spends quota.
+    def acquire(self, priority=PRIORITY_BATCH, daily=True, max_wait=OWM_MAX_WAIT, deadline=None):
+        started = time.monotonic()
+        give_up_at = started + max_wait
+        if deadline is not None:
+            give_up_at = min(give_up_at, deadline)
+        ticket = (priority, next(self._sequence))
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    if self._usage_date != self._today():
+                        self._usage_date, self._daily_used = self._today(), 0
+
+                    if daily and self._daily_used >= self.per_day:
+                        raise RateLimitExceeded(
+                            f"Daily OpenWeatherMap quota of {self.per_day} calls used up "
+                            "(resets at 00:00 UTC)")
+
+                    now = time.monotonic()
+                    if deadline is not None and now >= deadline:
+                        raise RateLimitExceeded("Deadline passed before a request slot freed up")
+
+                    wait = self._wait_time(now) if self._waiters[0] == ticket else None
+                    if wait == 0:
+                        break
+
+                    if now >= give_up_at:
+                        raise RateLimitExceeded(
+                            f"OpenWeatherMap rate limit: no request slot within {max_wait}s")
+                    self._cond.wait(give_up_at - now if wait is None else min(wait, give_up_at - now))
+
+                self._tokens -= 1
+                self.granted += 1
+                self.waited_seconds += time.monotonic() - started
+                if daily:
+                    self._daily_used += 1
+                    self._usage_dirty = True
+                flush_due = time.monotonic() - self._flushed_at >= USAGE_FLUSH_INTERVAL
+            finally:
+                # Leave the queue whether we got a token or gave up, and wake the next ticket
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+        if daily and flush_due:
+            self.flush()
+
+    # Feed back the status of a finished request. A 429 halves the refill rate and
+    # pauses the bucket (for Retry-After seconds when the server sends one).
+    def report(self, status_code, retry_after=None):
+        with self._cond:
+            if status_code == 429:
+                self.throttled += 1
+                self._rate_factor = max(OWM_MIN_RATE_FACTOR, self._rate_factor / 2)
+                self._tokens = min(self._tokens, 0.0)
+                pause = retry_after if retry_after is not None else OWM_THROTTLE_PAUSE
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                print(f"OpenWeatherMap returned 429; slowing to {self._rate_factor:.0%} "
+                      f"of the per-minute budget and pausing {pause:g}s")
+            elif status_code < 400 and self._rate_factor < 1.0:
+                self._rate_factor = min(1.0, self._rate_factor * 1.1)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "granted": self.granted,
+                "throttled": self.throttled,
+                "waited_seconds": round(self.waited_seconds, 2),
+                "daily_used": self._daily_used,
+                "daily_budget": self.per_day,
+                "rate_factor": round(self._rate_factor, 2)
+            }
+
+# Shared instance used by every OpenWeatherMap request in weather_service
+owm_rate_limiter = RateLimiter()
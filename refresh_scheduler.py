@@ -0,0 +1,135 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from settings import AUTO_REFRESH_INTERVAL
+
+# Refresh results arrive at most once per location per interval, so poll lazily
+REFRESH_POLL_MS = 500
+
+# True if two processed weather records differ, forecast included. WeatherSnapshot
+# equality ignores when the snapshot was taken, so a new clock alone never counts as a change.
+def weather_changed(old, new):
+    return old != new
+
+# Re-polls the displayed locations on a fixed interval using root.after.
+# Locations are staggered evenly across the interval so requests never burst, fetched
+# one at a time on a background worker, and skipped while their cached weather is
+# still fresh. on_update(index, location, weather) is called on the Tk thread, and only
+# when a location's weather actually changed; otherwise on_unchanged (if given) gets the
+# same arguments, so the caller can still move its "as of" time forward.
+#
+# Freshness is judged with half an interval of slack: fetch_func and is_fresh_func get
+# slack=interval/2, so a tick only skips (or is served from the cache) when the weather
+# was fetched well after the previous tick. Without it, an interval equal to the cache
+# TTL would find the weather it fetched one tick ago a few seconds short of the TTL
+# and skip every other tick.
+class RefreshScheduler:
+    def __init__(self, root, fetch_func, is_fresh_func, on_update, interval=AUTO_REFRESH_INTERVAL,
+                 on_unchanged=None):
+        self.root = root
+        self.fetch_func = fetch_func
+        self.is_fresh_func = is_fresh_func
+        self.on_update = on_update
+        self.on_unchanged = on_unchanged
+        self.interval = interval
+
+        self.refreshed = 0
+        self.skipped = 0
+        self.unchanged = 0
+
+        self._locations = {}   # index -> (city, state, country)
+        self._latest = {}      # index -> last weather shown
+        self._timers = {}      # index -> after() id
+        self._poll_id = None
+        self._results = queue.Queue()
+        self._executor = None
+        self._generation = 0   # Bumped on stop() so late results are ignored
+
+    @property
+    def slack(self):
+        return self.interval / 2
+
+    @property
+    def running(self):
+        return self._executor is not None
+
+    # Start polling the given {index: ((city, state, country), weather)} locations
+    def start(self, locations):
+        self.stop()
+        self._generation += 1
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="weather-refresh")
+
+        count = max(1, len(locations))
+        spacing_ms = int(self.interval * 1000 / count)
+        for offset, (index, (location, weather)) in enumerate(sorted(locations.items())):
+            self._locations[index] = location
+            self._latest[index] = weather
+            self._timers[index] = self.root.after(spacing_ms * (offset + 1), self._tick, index)
+
+        self._poll_id = self.root.after(REFRESH_POLL_MS, self._poll)
+        print(f"DEBUG::: Auto-refresh started for {len(locations)} location(s) every {self.interval}s")
+
+    # Cancel every pending timer and drop results still in flight
+    def stop(self):
+        for timer in self._timers.values():
+            self.root.after_cancel(timer)
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+        self._timers.clear()
+        self._locations.clear()
+        self._latest.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._generation += 1
+
+    def _tick(self, index):
+        location = self._locations.get(index)
+        if location is None:
+            return
+
+        # Re-arm first so one slow request never delays the schedule
+        self._timers[index] = self.root.after(int(self.interval * 1000), self._tick, index)
+
+        if self.is_fresh_func(*location, slack=self.slack):
+            self.skipped += 1
+            return
+
+        generation = self._generation
+        self._executor.submit(self._fetch, generation, index, location)
+
+    # Worker thread: fetch and hand the result to the Tk thread
+    def _fetch(self, generation, index, location):
+        try:
+            weather, error = self.fetch_func(*location, slack=self.slack)
+        except Exception as e:
+            weather, error = None, str(e)
+        self._results.put((generation, index, location, weather, error))
+
+    # Tk thread: apply refreshed weather, but only where it changed
+    def _poll(self):
+        while True:
+            try:
+                generation, index, location, weather, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation != self._generation or index not in self._locations:
+                continue
+            if error or not weather:
+                print(f"Auto-refresh failed for {location[0]}, {location[2]}: {error}")
+                continue
+
+            self.refreshed += 1
+            if not weather_changed(self._latest.get(index), weather):
+                self.unchanged += 1
+                self._latest[index] = weather
+                if self.on_unchanged is not None:
+                    self.on_unchanged(index, location, weather)
+                continue
+
+            self._latest[index] = weather
+            self.on_update(index, location, weather)
+
+        self._poll_id = self.root.after(REFRESH_POLL_MS, self._poll)
@@ -0,0 +1,47 @@
+import json
+import os
+import time
+from settings import SESSION_CACHE_PATH
+
+# Local copy of the signed-in session: the Firebase refresh token and the user's
+# profile, so the next start can restore the session with a token refresh instead of
+# a password sign-in and a Firestore read. Passwords are never written; the file is
+# readable by the current user only and is deleted on logout.
+
+# Profile fields that must not end up on disk
+SENSITIVE_FIELDS = ("password", "previously_used_passwords")
+
+# Returns {"uid", "refresh_token", "user_data", "saved_at"} or None
+def load_session(path=SESSION_CACHE_PATH):
+    try:
+        with open(path, "r") as f:
+            session = json.load(f)
+        if session.get("uid") and session.get("refresh_token"):
+            return session
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_session(uid, refresh_token, user_data, path=SESSION_CACHE_PATH):
+    session = {
+        "uid": uid,
+        "refresh_token": refresh_token,
+        "user_data": {key: value for key, value in (user_data or {}).items() if key not in SENSITIVE_FIELDS},
+        "saved_at": time.time()
+    }
+    try:
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(session, f, default=str)  # Firestore timestamps become strings
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not save session: {e}")
+
+def clear_session(path=SESSION_CACHE_PATH):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Could not remove saved session: {e}")
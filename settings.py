@@ -1,5 +1,3 @@
-import tkinter as tk
-
 # Image Settings
 IMAGE_WIDTH = 1080
 IMAGE_HEIGHT = 1080
@@ -26,7 +24,7 @@ BUTTON_STYLE = {
     "bg": "white",
     "fg": "black",
     "font": ("Helvetica", 12),
-    "relief": tk.RAISED,
+    "relief": "raised",
     "bd": 2,
     "padx": 10,
     "pady": 5
@@ -52,7 +50,8 @@ TEMPLATES = {
         "font_sizes": {
             "title": 65,
             "large": 35,
-            "medium": 25
+            "medium": 25,
+            "small": 18
         },
         "title_position": (115, 45),
         "date_position": (115, 145),
@@ -76,13 +75,21 @@ TEMPLATES = {
             (840, 555),
             (840, 690),
             (840, 825)
+        ],
+        "forecast_position": [  # Daily high/low line under each city name
+            (145, 345),
+            (145, 475),
+            (145, 600),
+            (145, 735),
+            (145, 870)
         ]
     },
     "story": {
         "font_sizes": {
             "title": 65,
             "large": 40,
-            "medium": 30
+            "medium": 30,
+            "small": 24
         },
         "title_position": (100, 165),
         "date_position": (100, 330),
@@ -106,6 +113,13 @@ TEMPLATES = {
             (900, 990),
             (900, 1165),
             (900, 1365)
+        ],
+        "forecast_position": [
+            (65, 662),
+            (65, 847),
+            (65, 1042),
+            (65, 1217),
+            (65, 1417)
         ]
     }
 }
@@ -114,4 +128,76 @@ TEMPLATES = {
 TEMPLATE_PATHS = {
     "post": "post_template.png",  # Should be 1080x1080
     "story": "story_template.png"  # Should be 1080x1920
-}
\ No newline at end of file
+}
+
+# Cache Settings
+GEOCODE_CACHE_PATH = "geocode_cache.sqlite3"  # Persistent city -> coordinates cache
+GEOCODE_CACHE_SIZE = 256  # Locations kept in memory in front of the database
+WEATHER_CACHE_TTL = 600  # Seconds a One Call payload is served as fresh (OWM updates ~every 10 min)
+WEATHER_CACHE_PRECISION = 2  # Decimal places lat/lon are rounded to for the cache key (~1 km)
+WEATHER_CACHE_SIZE = 512  # One Call payloads kept in memory
+
+# Network Settings
+HTTP_POOL_CONNECTIONS = 8  # Hosts kept in the connection pool, at least one per host the app talks to:
+                           # api.openweathermap.org, openweathermap.org (icons), identitytoolkit,
+                           # securetoken and storage.googleapis.com (avatars)
+HTTP_POOL_MAXSIZE = 10  # Keep-alive connections per host, at least one per fetch worker
+HTTP_TIMEOUT = (5, 15)  # (connect, read) timeout in seconds for every request
+HTTP_RETRIES = 3  # Retries for transient 5xx/429 responses and connection errors
+HTTP_BACKOFF_FACTOR = 0.5  # Exponential backoff base between retries (seconds)
+HTTP_BACKOFF_JITTER = 0.5  # Max random seconds added to each backoff
+
+# OpenWeatherMap Settings
+OWM_BASE_URL = "https://api.openweathermap.org"  # Overridden by the OWM_BASE_URL environment variable
+
+# Rate Limit Settings
+OWM_CALLS_PER_MINUTE = 60  # Requests per minute across every OpenWeatherMap API
+OWM_CALLS_PER_DAY = 1000  # One Call requests per day (the free One Call 3.0 allowance)
+OWM_USAGE_PATH = "owm_usage.json"  # Today's One Call count, kept across runs
+OWM_MIN_RATE_FACTOR = 0.1  # Slowest the limiter backs off to after repeated 429s
+OWM_THROTTLE_PAUSE = 10  # Seconds to pause after a 429 without a Retry-After header
+OWM_MAX_WAIT = 120  # Longest a request waits for a slot before failing
+
+# Firebase Settings
+FIREBASE_WARM_UP = True  # Initialize Firebase in the background once the login window is shown
+
+# Session Settings
+REMEMBER_SESSION = True  # Keep the Firebase refresh token so the next start skips the password sign-in
+SESSION_CACHE_PATH = "session.json"  # Refresh token + profile (without passwords); deleted on logout
+
+# Profile Settings
+PROFILE_IMAGE_SIZE = 125  # Avatar size in the profile windows
+PROFILE_PLACEHOLDER_PATH = "Images/profile_image_placeholder_white.png"
+
+# Preload Settings
+PRELOAD_ON_LOGIN = True  # Warm templates, fonts, icons, country codes and logos while the login screen is up
+APP_LOGO_PATH = "Images/FelipeWeatherAppLogo.png"
+APP_LOGO_SIZES = (32, 75, 125, 150)  # Login icon, main window icon / reset dialog, main header, login header
+
+# Country Code Settings
+COUNTRY_CODES_PATH = "country_code_data.json"  # Bundled country index
+COUNTRY_CODES_SYNC_PATH = "country_codes_synced.json"  # Last copy synced from Firestore
+COUNTRY_CODES_COLLECTION = "countries"
+COUNTRY_CODES_VERSION_DOC = ("meta", "countries")  # Holds the collection's "version" stamp
+COUNTRY_CODES_SYNC = True  # Check Firestore for a newer country list after login
+
+# Weather Icon Settings
+WEATHER_ICON_DIR = "Images"  # Bundled OpenWeatherMap icons (01d@2x.png ... 50n@2x.png)
+WEATHER_ICON_SIZE = 50  # Icon size in the city tab header
+FORECAST_ICON_SIZE = 32  # Icon size in the city tab forecast strip
+WEATHER_ICON_SIZES = (WEATHER_ICON_SIZE, FORECAST_ICON_SIZE)  # Sizes pre-scaled when the atlas loads
+WEATHER_ICON_URL = "http://openweathermap.org/img/wn/{icon}@2x.png"  # Fallback for unknown codes
+
+# One Call Settings
+ONECALL_PARTS = ("current", "minutely", "hourly", "daily", "alerts")  # Blocks the API's exclude= accepts
+ONECALL_DEFAULT_PARTS = ("current", "hourly", "daily", "alerts")  # Requested when a caller doesn't say
+GUI_ONECALL_PARTS = ("current", "daily")  # City tabs: meters, today's min/max and the forecast strip
+
+# Forecast Settings
+FORECAST_DAYS = 3  # Days (today first) shown on city tabs and export templates
+
+# GUI Settings
+LAZY_TAB_BUILD = True  # Build city tab contents on first view / idle time (False builds every tab up front)
+AUTO_REFRESH_INTERVAL = 600  # Seconds between refreshes of each displayed location
+AUTO_REFRESH_ENABLED = False  # Start with auto-refresh on (it can also be toggled from the Actions menu)
+STARTUP_REPORT_PATH = "startup_report.json"  # Default output of weather_api.py --profile-startup
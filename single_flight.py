@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import Future
+
+# Coalesces concurrent identical requests. The first caller for a key runs the
+# function; anyone asking for the same key while it is still in flight waits on the
+# same Future and gets the same result (or exception) instead of sending a duplicate
+# request. Once the call finishes the key is released, so later calls go through the
+# caches as usual.
+class SingleFlight:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.deduplicated = 0
+
+        self._in_flight = {}  # key -> Future
+        self._lock = threading.Lock()
+
+    # Run func() once per key at a time and return its result to every caller
+    def do(self, key, func):
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "deduplicated": self.deduplicated,
+                "in_flight": len(self._in_flight)
+            }
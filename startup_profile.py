@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# Startup profiler. Launches the app in a child interpreter with -X importtime and
+# records where a cold start goes:
+#   - per-module import time (self and cumulative, from -X importtime)
+#   - import weather_api, configure(), root window creation, LoginScreen construction
+#   - time-to-first-paint of the login window
+#   - Firebase init, measured cold after the first paint (it no longer blocks it;
+#     the login screen's background warm-up is switched off in the child)
+# and writes everything to a JSON report so startup regressions can be tracked.
+#
+# Usage: python weather_api.py --profile-startup [report.json]
+#        python startup_profile.py [--output report.json] [--top 25]
+#
+# Only the standard library is imported here, so nothing is loaded before the child's timer starts.
+
+CHILD_FLAG = "--child"
+
+# Parse -X importtime output into [{"module", "depth", "self_ms", "cumulative_ms"}]
+def parse_import_times(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            name = name.rstrip()[1:]  # Drop the separator's space; the rest is nesting
+            modules.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000
+            })
+        except ValueError:
+            continue
+    return modules
+
+# Parent side: run the child, combine its phases with the import times, write the report
+def profile_startup(output_path, top=25):
+    script = os.path.abspath(__file__)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", script, CHILD_FLAG],
+        capture_output=True, text=True, cwd=os.path.dirname(script))
+
+    phases = {}
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("{"):
+            phases = json.loads(line)
+            break
+    if not phases:
+        print(f"Startup profile failed (exit code {result.returncode}):")
+        print("\n".join(line for line in result.stderr.splitlines() if not line.startswith("import time:")))
+        return None
+
+    modules = parse_import_times(result.stderr)
+    # Depth 1: what the entry modules (weather_api, site) import directly
+    direct = [m for m in modules if m["depth"] == 1]
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "phases_ms": phases["phases_ms"],
+        "time_to_first_paint_ms": phases.get("time_to_first_paint_ms"),
+        "errors": phases["errors"],
+        "import_total_ms": round(sum(m["self_ms"] for m in modules), 1),
+        "slowest_imports": sorted(direct, key=lambda m: m["cumulative_ms"], reverse=True)[:top],
+        "imports": modules
+    }
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_summary(report, output_path)
+    return report
+
+def print_summary(report, output_path):
+    print("Startup profile")
+    for phase, ms in report["phases_ms"].items():
+        print(f"  {phase:<22} {ms:9.1f} ms")
+    if report["time_to_first_paint_ms"] is not None:
+        print(f"  {'time to first paint':<22} {report['time_to_first_paint_ms']:9.1f} ms")
+    for phase, error in report["errors"].items():
+        print(f"  {phase:<22} failed: {error}")
+    print("Slowest direct imports (cumulative)")
+    for module in report["slowest_imports"][:10]:
+        print(f"  {module['module']:<30} {module['cumulative_ms']:9.1f} ms")
+    print(f"Report written to {output_path}")
+
+# Child side: repeat weather_api.main() step by step with timers around each phase
+def run_child():
+    started = time.perf_counter()
+    phases = {}
+    errors = {}
+    first_paint = None
+
+    def timed(name, func):
+        phase_started = time.perf_counter()
+        try:
+            return func()
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+        finally:
+            phases[name] = round((time.perf_counter() - phase_started) * 1000, 1)
+
+    weather_api = timed("import_weather_api", lambda: __import__("weather_api"))
+    if weather_api is not None:
+        # The login screen normally starts Firebase (and the other preloads) in the
+        # background and may restore a saved session. Switch that off here so
+        # firebase_init below measures a cold init rather than what is left of a
+        # warm-up already running on the preloader thread.
+        login_screen = sys.modules["login_screen"]
+        login_screen.PRELOAD_ON_LOGIN = False
+        login_screen.FIREBASE_WARM_UP = False
+        login_screen.REMEMBER_SESSION = False
+
+        timed("configure", weather_api.configure)
+        root = timed("create_window", weather_api.create_root_window)
+        if root is not None:
+            weather_api.root = root
+            timed("login_screen", lambda: weather_api.LoginScreen(root, weather_api.on_login_success))
+
+            # First paint: the login window has been mapped and drawn
+            def paint():
+                root.wait_visibility()
+                root.update()
+            timed("first_paint", paint)
+            if "first_paint" not in errors:
+                first_paint = round((time.perf_counter() - started) * 1000, 1)
+
+        import firebase_config
+        timed("firebase_init", lambda: (firebase_config.db.resolve(), firebase_config.auth.resolve()))
+        if root is not None:
+            root.destroy()
+
+    print(json.dumps({"phases_ms": phases, "time_to_first_paint_ms": first_paint, "errors": errors}))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the app's cold start")
+    parser.add_argument("--output", default=None, help="Where to write the JSON report")
+    parser.add_argument("--top", type=int, default=25, help="Slowest imports listed in the report summary")
+    parser.add_argument(CHILD_FLAG, action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child()
+        return 0
+
+    from settings import STARTUP_REPORT_PATH
+    return 0 if profile_startup(args.output or STARTUP_REPORT_PATH, args.top) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import heapq
+import unittest
+from unittest import mock
+import weather_cache
+from refresh_scheduler import RefreshScheduler
+from weather_cache import WeatherCache
+
+# Drives RefreshScheduler._tick on a fake clock against a real WeatherCache.
+# Run from the project root: python -m unittest discover tests
+
+LOCATION = ("Austin", "Texas", "US")
+FETCH_SECONDS = 2  # Each fetch takes this long on the fake clock
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+# Stands in for the Tk root: after() timers run in due order as the clock moves on
+class FakeRoot:
+    def __init__(self, clock):
+        self.clock = clock
+        self._timers = []
+        self._next_id = 0
+
+    def after(self, ms, func, *args):
+        self._next_id += 1
+        heapq.heappush(self._timers, (self.clock.now + ms / 1000, self._next_id, func, args))
+        return self._next_id
+
+    def after_cancel(self, timer_id):
+        self._timers = [timer for timer in self._timers if timer[1] != timer_id]
+        heapq.heapify(self._timers)
+
+    def run_until(self, end):
+        while self._timers and self._timers[0][0] <= end:
+            due, _, func, args = heapq.heappop(self._timers)
+            self.clock.now = max(self.clock.now, due)
+            func(*args)
+        self.clock.now = end
+
+# Runs submitted work right away instead of on a worker thread
+class InlineExecutor:
+    def submit(self, func, *args):
+        func(*args)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+class RefreshSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(weather_cache.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.interval = 600
+        self.cache = WeatherCache(ttl=self.interval)
+        self.root = FakeRoot(self.clock)
+        self.api_calls = 0
+
+        self.scheduler = RefreshScheduler(
+            self.root, self.fetch, self.is_fresh, lambda *args: None, interval=self.interval)
+        self.scheduler.start({0: (LOCATION, None)})
+        self.scheduler._executor = InlineExecutor()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def call_api(self, parts):
+        self.api_calls += 1
+        self.clock.now += FETCH_SECONDS
+        return {"current": {"dt": self.clock.now}}, None
+
+    def fetch(self, city, state, country, slack=0):
+        return self.cache.get_or_fetch(0, 0, self.call_api, allow_stale=False, slack=slack)
+
+    def is_fresh(self, city, state, country, slack=0):
+        return self.cache.is_fresh(0, 0, slack=slack)
+
+    def test_interval_equal_to_ttl_refreshes_every_tick(self):
+        ticks = 6
+        self.root.run_until(self.clock.now + self.interval * ticks + 1)
+
+        self.assertEqual(self.api_calls, ticks)
+        self.assertEqual(self.scheduler.skipped, 0)
+
+    def test_skips_tick_after_recent_fetch(self):
+        # Something else (e.g. a manual fetch) got the weather shortly before the tick
+        self.root.run_until(self.clock.now + self.interval - 60)
+        self.fetch(*LOCATION)
+        self.root.run_until(self.clock.now + 61)
+
+        self.assertEqual(self.api_calls, 1)
+        self.assertEqual(self.scheduler.skipped, 1)
+
+if __name__ == "__main__":
+    unittest.main()
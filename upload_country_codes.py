@@ -1,26 +1,97 @@
-import json
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from country_codes import read_country_file
 from firebase_config import db
+from settings import COUNTRY_CODES_PATH, COUNTRY_CODES_COLLECTION, COUNTRY_CODES_VERSION_DOC
 
-# Function to upload country codes to Firestore
-def upload_country_codes(json_path="country_code_data.json"):
+# Firestore allows at most 500 operations in one batched write
+BATCH_LIMIT = 500
+COMMIT_WORKERS = 4
+
+# Compare the JSON entries with the documents already in Firestore.
+# Returns (inserts, updates, deletes); inserts/updates are {code: data}, deletes a list of codes
+def diff_country_codes(country_data, existing):
+    wanted = {entry["code"]: {"code": entry["code"], "name": entry["name"]} for entry in country_data}
+
+    inserts = {code: data for code, data in wanted.items() if code not in existing}
+    updates = {code: data for code, data in wanted.items()
+               if code in existing and existing[code] != data}
+    deletes = [code for code in existing if code not in wanted]
+    return inserts, updates, deletes
+
+# Split the write operations into Firestore batches of at most BATCH_LIMIT operations
+def build_batches(collection, inserts, updates, deletes):
+    operations = [("set", code, data) for code, data in {**inserts, **updates}.items()]
+    operations += [("delete", code, None) for code in deletes]
+
+    batches = []
+    for start in range(0, len(operations), BATCH_LIMIT):
+        batch = db.batch()
+        for action, code, data in operations[start:start + BATCH_LIMIT]:
+            doc_ref = collection.document(code)
+            if action == "set":
+                batch.set(doc_ref, data)
+            else:
+                batch.delete(doc_ref)
+        batches.append(batch)
+    return batches
+
+# Bring the Firestore countries collection in line with the JSON file, writing only what changed
+def upload_country_codes(json_path=COUNTRY_CODES_PATH, dry_run=False):
     try:
-        with open(json_path, "r") as f:
-            country_data = json.load(f)
+        started = time.perf_counter()
+
+        country_data, _ = read_country_file(json_path)
 
-        for entry in country_data:
-            code = entry["code"]
-            name = entry["name"]
-            doc_ref = db.collection("countries").document(code)
-            doc_ref.set({
-                "code": code,
-                "name": name
-            })
+        # Read the current collection once
+        collection = db.collection(COUNTRY_CODES_COLLECTION)
+        existing = {doc.id: doc.to_dict() for doc in collection.stream()}
+        read_seconds = time.perf_counter() - started
 
-        print("Country codes uploaded successfully.")
+        inserts, updates, deletes = diff_country_codes(country_data, existing)
+        print(f"Read {len(existing)} documents in {read_seconds:.2f}s: "
+              f"{len(inserts)} to insert, {len(updates)} to update, {len(deletes)} to delete")
+
+        if dry_run:
+            for code, data in sorted(inserts.items()):
+                print(f"  + {code}: {data['name']}")
+            for code, data in sorted(updates.items()):
+                print(f"  ~ {code}: {existing[code].get('name')} -> {data['name']}")
+            for code in sorted(deletes):
+                print(f"  - {code}: {existing[code].get('name')}")
+            print("Dry run: nothing was written.")
+            return
+
+        if not (inserts or updates or deletes):
+            print("Country codes already up to date.")
+            return
+
+        # Commit the batches concurrently
+        write_started = time.perf_counter()
+        batches = build_batches(collection, inserts, updates, deletes)
+        with ThreadPoolExecutor(max_workers=COMMIT_WORKERS) as executor:
+            list(executor.map(lambda batch: batch.commit(), batches))
+
+        # Bump the version stamp so clients re-sync their local country index
+        stamp_ref = db.collection(COUNTRY_CODES_VERSION_DOC[0]).document(COUNTRY_CODES_VERSION_DOC[1])
+        stamp = stamp_ref.get()
+        version = ((stamp.to_dict() or {}).get("version", 0) if stamp.exists else 0) + 1
+        stamp_ref.set({"version": version, "count": len(country_data)})
+
+        write_seconds = time.perf_counter() - write_started
+        writes = len(inserts) + len(updates) + len(deletes)
+        print(f"Wrote {writes} changes in {len(batches)} batch(es) in {write_seconds:.2f}s "
+              f"(total {time.perf_counter() - started:.2f}s); version stamp is now {version}.")
 
     except Exception as e:
         print(f"Error uploading country codes: {e}")
 
 # Run the upload
 if __name__ == "__main__":
-    upload_country_codes()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sync the Firestore countries collection with the JSON file")
+    parser.add_argument("json_path", nargs="?", default=COUNTRY_CODES_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Show the diff without writing anything")
+    args = parser.parse_args()
+
+    upload_country_codes(args.json_path, dry_run=args.dry_run)
@@ -1,30 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from urllib.request import urlopen
-from firebase_config import db, bucket
-from firebase_admin import auth
+from firebase_config import auth, bucket
 import session_state
 from PIL import Image, ImageTk, ImageOps
 import ttkbootstrap as ttkb
 import os
-import ssl
 from io import BytesIO
-import random
+from fetch_engine import POLL_INTERVAL_MS
+from profile_store import profile_store
+from settings import PROFILE_IMAGE_SIZE
 
+# Avatar (or placeholder) as a 125x125 PIL image, downloaded once per URL
 def load_profile_image_from_url(url):
-    try:
-        url_with_buster = f"{url}?cache_buster={random.randint(1, 999999)}"
-        context = ssl._create_unverified_context()
-        with urlopen(url_with_buster, context=context) as response:
-            img = Image.open(BytesIO(response.read()))
-            img = ImageOps.exif_transpose(img)  # Handle orientation
-            img = img.resize((125, 125), Image.LANCZOS)  # Resize to 125x125
-            return img
-    except Exception as e:
-        print("Error loading image from URL:", e)
-        img = Image.open("Images/profile_image_placeholder_white.png")
-        img = img.resize((125, 125), Image.LANCZOS)  # Resize to 125x125
-        return img
+    return profile_store.avatar(url)
+
+# Tell the user if an optimistic profile write was rejected (the store has already
+# dropped the change). Polled from the Tk thread like the fetch engine's results.
+def report_failed_write(widget, future):
+    if not future.done():
+        widget.after(POLL_INTERVAL_MS, report_failed_write, widget, future)
+        return
+    if future.exception() is not None:
+        messagebox.showerror("Update Error", f"Your changes could not be saved: {future.exception()}")
 
 def view_profile():
     global main_frame, root
@@ -34,9 +31,9 @@ def view_profile():
     profile_window.grab_set()
     profile_window.focus_set()
 
-    # Fetch user data first 
-    user_doc = db.collection("users").document(session_state.current_user_uid).get()
-    user_data = user_doc.to_dict()
+    # Rendered from the in-memory profile; no document read after login
+    user_data = profile_store.get()
+    print(f"DEBUG::: [PROFILE] {profile_store.stats()}")
 
     if not user_data:
         messagebox.showerror("Error", "User profile could not be loaded.")
@@ -186,10 +183,8 @@ def edit_profile():
     edit_window.grab_set()
     edit_window.focus_set()
 
-    # Fetch user data first
-    user_ref = db.collection("users").document(session_state.current_user_uid)
-    user_doc = user_ref.get()
-    user_data = user_doc.to_dict()
+    # Rendered from the in-memory profile; no document read after login
+    user_data = profile_store.get()
 
     if not user_data:
         messagebox.showerror("Error", "User profile could not be loaded.")
@@ -253,7 +248,7 @@ def edit_profile():
             # Resize locally in memory
             img = Image.open(file_path)
             img = ImageOps.exif_transpose(img)  # Handle orientation
-            img = img.resize((125, 125), Image.LANCZOS)
+            img = img.resize((PROFILE_IMAGE_SIZE, PROFILE_IMAGE_SIZE), Image.LANCZOS)
 
             # Convert to BytesIO for upload
             buffer = BytesIO()
@@ -266,12 +261,16 @@ def edit_profile():
             blob.upload_from_file(buffer, content_type="image/png")
             blob.make_public()
 
-            # Save public URL to Firestore
-            user_ref.update({"profile_image_url": blob.public_url})
+            # Keep the uploaded image so it is not downloaded again, then save
+            # the public URL to Firestore
+            profile_store.set_avatar(blob.public_url, img)
+            root = edit_window.master
+            write = profile_store.update({"profile_image_url": blob.public_url})
 
             messagebox.showinfo("Success", "Profile image uploaded!")
             edit_window.destroy()
             view_profile()
+            report_failed_write(root, write)
         except Exception as e:
             messagebox.showerror("Upload Failed", str(e))
 
@@ -381,15 +380,18 @@ def edit_profile():
                     "country": form_vars["country"].get().strip(),
                 }
             }
-            user_ref.update(updates)
-
             new_pass = form_vars["new_password"].get().strip()
             if new_pass:
                 auth.update_user(session_state.current_user_uid, password=new_pass)
 
+            # Shown right away; Firestore is updated in the background
+            root = edit_window.master
+            write = profile_store.update(updates)
+
             messagebox.showinfo("Success", "Profile updated successfully!")
             edit_window.destroy()
             view_profile()
+            report_failed_write(root, write)
         except Exception as e:
             messagebox.showerror("Update Error", str(e))
     
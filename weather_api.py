@@ -1,22 +1,32 @@
-import requests
-import json
 import tkinter as tk
 from tkinter import StringVar, messagebox, filedialog, ttk
 from dotenv import load_dotenv
 import os
-from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageTk
-from datetime import datetime, date, timezone, timedelta
+import sys
+import time
+from PIL import ImageOps, ImageTk
 from settings import (
     IMAGE_WIDTH, IMAGE_HEIGHT, BACKGROUND_COLOR, FONTS, 
-    LINE_SPACING, TEXT_COLOR, BUTTON_COLOR, EXPORT_FORMATS,
-    TEMPLATES, TEMPLATE_PATHS, DEFAULT_FONT, TEXT_COLOR_DARK,
-    BUTTON_STYLE
+    LINE_SPACING, BUTTON_COLOR, EXPORT_FORMATS, TEMPLATE_PATHS,
+    BUTTON_STYLE, COUNTRY_CODES_SYNC, LAZY_TAB_BUILD, AUTO_REFRESH_ENABLED, STARTUP_REPORT_PATH
 )
-from io import BytesIO
-import urllib.request
 from ttkbootstrap import Window, Style
 from ttkbootstrap.constants import *
-from firebase_config import db
+from country_codes import get_country_code_list, sync_country_codes_in_background
+from owm_transport import configure_from_env as configure_transport_from_env
+from fetch_engine import FetchBatch, POLL_INTERVAL_MS
+from weather_cache import weather_cache
+from weather_service import (
+    owm_api_key, fetch_location_weather, coalescing_stats, rate_limit_stats,
+    refresh_location_weather, is_location_fresh
+)
+from refresh_scheduler import RefreshScheduler
+from city_tab import CityTabPool
+from image_renderer import render_weather_image, save_weather_image, template_date_text
+from asset_cache import get_logo
+from preloader import preloader
+from session_cache import clear_session
+from profile_store import profile_store
 from login_screen import LoginScreen
 import ttkbootstrap as ttkb
 from user_profile import edit_profile, view_profile
@@ -38,7 +48,18 @@ button_frame = None
 logout_button = None
 description_label_frame = None
 notebook = None
-meter_widgets = []
+tab_pool = None  # CityTabPool that keeps city tabs alive between fetches
+displayed_results = {}  # Location entry index -> weather shown in its tab
+refresh_scheduler = None
+auto_refresh_var = None
+idle_build_scheduled = False
+fetch_started_at = 0.0
+first_tab_pending = False
+weather_button = None
+active_fetch_batch = None
+fetch_progress_frame = None
+fetch_progress_bar = None
+fetch_progress_label = None
 
 # Image references to prevent garbage collection
 image_references = {}
@@ -46,9 +67,10 @@ image_references = {}
 # Loads environment variables and verifies required template images exist
 def configure():
     load_dotenv()
+    configure_transport_from_env()  # Optional OWM record/replay (see owm_transport.py)
     
     # Verify API key exists
-    if not os.getenv("API_KEY"):
+    if not owm_api_key():
         messagebox.showerror("Configuration Error", "OpenWeatherMap API key not found in .env file")
         return False
     
@@ -60,338 +82,79 @@ def configure():
      
     return True
 
-# Fetch weather data from OpenWeatherMap API with robust error handling
-def fetch_weather_data(city_name, state_name, country_code):
-    api_key = os.getenv("API_KEY")
-    if not api_key:
-        messagebox.showerror("API Error", "OpenWeatherMap API key not configured")
-        return None
-    
-    # Step 1: Get coordinates for the city using the Direct Geocoding API
-    if country_code == "US":
-        # For US, use state abbreviation
-        geocode_url = f"http://api.openweathermap.org/geo/1.0/direct?q={city_name},{state_name},{country_code}&units=metric&limit=5&appid={api_key}"
-    else:
-        geocode_url = f"http://api.openweathermap.org/geo/1.0/direct?q={city_name},{country_code}&units=metric&limit=5&appid={api_key}"
-
-    try:
-        # Get location coordinates
-        geo_response = requests.get(geocode_url, timeout=15)
-        if geo_response.status_code != 200:
-            return None, f"Geocoding API error (Code: {geo_response.status_code})"
-        
-        geo_data = geo_response.json()
-        if not geo_data:
-            return None, f"Geocoding API returned no results for {city_name}, {state_name if country_code == 'US' else ''}, {country_code}"
-        
-        # Extract latitude and longitude
-        lat = geo_data[0]['lat']
-        lon = geo_data[0]['lon']
-
-    # Step 2: Use the coordinates to get weather data
-        weather_url = f"https://api.openweathermap.org/data/3.0/onecall?lat={lat}&lon={lon}&exclude=minutely&units=metric&appid={api_key}"
-        weather_response = requests.get(weather_url, timeout=15)
-
-        if weather_response.status_code != 200:
-            return None, f"Weather API error (Code: {weather_response.status_code})"
-        
-        weather_data = weather_response.json()
-        return weather_data, None
-    
-    except requests.exceptions.Timeout:
-        return None, "Request timed out - server took too long to respond"
-    except requests.exceptions.ConnectionError:
-        return None, "Network connection failed - check your internet"
-    except json.JSONDecodeError:
-        return None, "Invalid response format - could not decode JSON"
-    except Exception as e:
-        return None, f"Unexpected error: {str(e)}"
-
-# Process the raw API data into a more usable format
-def process_weather_data(data):
-    if not data:
-        return None
-
-    current = data.get("current", {})
-    daily = data.get("daily", [{}])[0]  # Get today's weather
-    tz_offset = data.get("timezone_offset", 0)  # in seconds
-    timezone_name = data.get("timezone", "")
-
-    def timestamp_to_local(ts):
-        utc_time = datetime.fromtimestamp(ts, timezone.utc)
-        return utc_time + timedelta(seconds=tz_offset)
-
-    # Convert timestamps to local time
-    sunrise_local = timestamp_to_local(current.get("sunrise", 0))
-    sunset_local = timestamp_to_local(current.get("sunset", 0))
-
-    # Current time calculation
-    current_time_local = datetime.now(timezone.utc) + timedelta(seconds=tz_offset)
-
-    # Temperature data (using daily forecast for min/max)
-    temp = current.get("temp", 0)
-    feels_like = current.get("feels_like", 0)
-    temp_min = daily.get("temp", {}).get("min", temp)
-    temp_max = daily.get("temp", {}).get("max", temp)
-    humidity = current.get("humidity", 0)
-    pressure = current.get("pressure", 0)
-    dew_point = current.get("dew_point", 0)
-    uv_index = current.get("uvi", 0)
-    clouds = current.get("clouds", 0)
-    sea_level = current.get("sea_level", 0)
-    visibility = current.get("visibility", 0)
-
-    # Weather conditions
-    weather = current.get("weather", [{}])[0]  
-    condition = weather.get("main", "")
-    description = weather.get("description", "").capitalize()
-    icon = weather.get("icon", "")
-
-    # Wind data
-    wind_speed = current.get("wind_speed", 0)
-    wind_deg = current.get("wind_deg", 0)
-    wind_gust = current.get("wind_gust", 0)
-
-    return {
-        #Temperature Data
-        "temp_celsius": round(temp, 2),
-        "temp_fahrenheit": round((temp * 9/5 + 32),1),
-        "feels_like_celsius": round(feels_like, 2),
-        "feels_like_fahrenheit": (feels_like * 9/5 + 32),
-        "temp_min_celsius": round(temp_min, 2),
-        "temp_min_fahrenheit": (temp_min * 9/5 + 32),
-        "temp_max_celsius": round(temp_max, 2),
-        "temp_max_fahrenheit": round(temp_max * 9/5 + 32, 2),
-
-        #Atmospheric Data
-        "pressure": pressure,
-        "humidity": humidity,
-        "dew_point": (dew_point* 9/5 + 32),
-        "uv_index": round(uv_index,2),
-        "clouds": clouds,
-        "visibility": round(visibility / 1609.34, 1) if visibility else 0,
-        "sea_level": sea_level,
-
-        #Weather Conditions
-        "condition": condition,
-        "description": description,
-        "icon": icon,
-
-        #Wind Data
-        "wind_speed": round(wind_speed, 2),
-        "wind_deg": wind_deg,
-        "wind_gust": round(wind_gust, 2),
-
-        #Sunrise/Sunset Data
-        "sunrise": sunrise_local.strftime('%H:%M:%S'),
-        "sunset": sunset_local.strftime('%H:%M:%S'),
-
-        #Location Data
-        "timezone": tz_offset,
-        "timezone_name": timezone_name,
-        "current_time": current_time_local.strftime('%H:%M:%S'),
-        "current_date": current_time_local.strftime('%Y-%m-%d')
-    }
-
-# Display weather information in the GUI
-def display_weather(weather_info, city_name, state_name, country_code):
+# Display weather information in the GUI. The tab (reused from the pool when possible)
+# appears at once; new widgets are built when it is first selected or, for background
+# tabs, when the GUI is idle
+def display_weather(weather_info, city_name, state_name, country_code, index=0):
     if not weather_info:
         messagebox.showerror("Error", "City Not Found. Please enter a valid city name.")
         return
 
-    # Create a new tab for this city
-    city_tab = ttk.Frame(
-        notebook, 
-        padding=10)
-    
-    notebook.add(
-        city_tab, 
-        text=f"{city_name.title()}, {state_name.title()}, {country_code.upper()}")
-    
-    # Create header frame with city name and weather icon
-    header_frame = ttk.Frame(city_tab)
+    tab = tab_pool.show(index, weather_info, city_name, state_name, country_code)
 
-    header_frame.pack(
-        fill=tk.X, 
-        pady=5)
-    
-    # Add weather icon
-    try:
-        icon_url = f"http://openweathermap.org/img/wn/{weather_info['icon']}@2x.png"
-        with urllib.request.urlopen(icon_url) as u:
-            raw_data = u.read()
-        im = Image.open(BytesIO(raw_data))
-        im = im.resize((50, 50))
-        photo = ImageTk.PhotoImage(im)
-
-        icon_label = ttk.Label(
-            header_frame, 
-            image=photo)
-        
-        icon_label.image = photo  # Keep reference
-        
-        icon_label.pack(
-            side=tk.LEFT, 
-            padx=10)
-    except Exception as e:
-        print(f"Couldn't load weather icon: {e}")
-    
-    # Add city name and condition
-    title_frame = ttk.Frame(header_frame)
+    if LAZY_TAB_BUILD:
+        schedule_idle_tab_build()
+    else:
+        build_city_tab(tab)
+    return tab
 
-    title_frame.pack(
-        side=tk.LEFT, 
-        fill=tk.X, 
-        expand=True)
-    
-    city_name_label = ttk.Label(
-        title_frame,
-        text=f"{city_name.title()}, {state_name.title()}, {country_code.upper()}",
-        font=("Helvetica", 18, "bold"),
-        bootstyle="primary"
-    )
-    city_name_label.pack(anchor=tk.W)
-    
-    weather_condition_label = ttk.Label(
-        title_frame,
-        text=f"{weather_info['condition']} ({weather_info['description']})",
-        font=("Helvetica", 14),
-        bootstyle="secondary"
-    )
-    weather_condition_label.pack(anchor=tk.W)
-    
-    # Create meter grid
-    meter_frame = ttk.Frame(city_tab)
-    meter_frame.pack(
-        fill=tk.BOTH, 
-        expand=True, 
-        pady=10)
-    
-    # Define meter configurations
-    meter_configs = [
-        # (title, value, max_value, unit, style)
-        ("Temperature", weather_info['temp_fahrenheit'], 120, "°F", "danger"),
-        ("Feels Like", weather_info['feels_like_fahrenheit'], 120, "°F", "warning"),
-        ("Humidity", weather_info['humidity'], 100, "%", "info"),
-        ("Pressure", weather_info['pressure'], 1110, "inHg", "success"),
-        ("UV Index", weather_info['uv_index'], 11, "", "danger"),
-        ("Cloudiness", weather_info['clouds'], 100, "%", "secondary"),
-        ("Wind Speed", weather_info['wind_speed'], 30, "mph", "primary"),
-        ("Wind Gust", weather_info['wind_gust'], 45, "mph", "primary"),
-        ("Dew Point", weather_info['dew_point'], 80, "°F", "info"),
-        ("Visibility", weather_info['visibility'], 10, "mi", "success")
-    ]
-    
-    # Create 2x4 grid of meters
-    for i, (title, value, max_val, unit, style) in enumerate(meter_configs):
-        row = i // 5
-        col = i % 5
-        
-        meter = ttkb.Meter(
-            meter_frame,
-            metersize=150,
-            amountused=value,
-            amounttotal=max_val,
-            metertype="semi",
-            stripethickness=8,
-            subtext=title,
-            textright=unit,
-            interactive=False,
-            bootstyle=style
-        )
+# Build a tab's contents and report time-to-first-tab for the current fetch
+def build_city_tab(tab):
+    global first_tab_pending
 
-        meter.grid(
-            row=row, 
-            column=col, 
-            padx=10, 
-            pady=10, 
-            sticky="nsew")
-        
-        meter_widgets.append(meter)  # Keep reference
-        
-        # Configure grid weights
-        meter_frame.grid_rowconfigure(
-            row, 
-            weight=1)
-        
-        meter_frame.grid_columnconfigure(
-            col, 
-            weight=1)
-    
-    # Additional info frame
-    info_frame = ttk.Labelframe(
-        city_tab,
-        text="Additional Information",
-        bootstyle="info"
-    )
+    tab.build()  # Does nothing for a pooled tab that is already built
 
-    info_frame.pack(
-        fill=tk.BOTH, 
-        pady=5)
-    
-    # Create two columns for additional info
-    left_col = ttk.Frame(info_frame)
+    if first_tab_pending:
+        first_tab_pending = False
+        elapsed = time.perf_counter() - fetch_started_at
+        print(f"DEBUG::: time-to-first-tab {elapsed * 1000:.0f} ms "
+              f"(tab build {tab.build_seconds * 1000:.0f} ms, lazy={LAZY_TAB_BUILD})")
 
-    left_col.pack(
-        side=tk.LEFT, 
-        fill=tk.BOTH, 
-        expand=True, 
-        padx=10, 
-        pady=5)
-    
-    right_col = ttk.Frame(info_frame)
+# Build the selected tab as soon as it is shown
+def on_notebook_tab_changed(event=None):
+    if tab_pool is None:
+        return
+    tab = tab_pool.get(notebook.select())
+    if tab:
+        build_city_tab(tab)
 
-    right_col.pack(
-        side=tk.LEFT, 
-        fill=tk.BOTH, 
-        expand=True, 
-        padx=10, 
-        pady=5)
-    
-    # Add info labels
-    infos = [
-        ("Sunrise:", weather_info['sunrise']),
-        ("Sunset:", weather_info['sunset']),
-        ("Timezone:", weather_info['timezone_name']),
-        ("Current Time:", f"{weather_info['current_time']} ({weather_info['current_date']})")
-    ]
-    
-    for i, (label, value) in enumerate(infos):
-        col = left_col if i % 2 == 0 else right_col
-        info_row = ttk.Frame(col)
-        info_row.pack(
-            fill=tk.X, 
-            pady=2)
-        
-        info_label=ttk.Label(
-            info_row,
-            text=label,
-            bootstyle="primary",
-            font=("Helvetica", 14, "bold")
-        )
-        info_label.pack(side=tk.LEFT)
-        
-        value_label=ttk.Label(
-            info_row,
-            text=value,
-            bootstyle="secondary",
-            font=("Helvetica", 13)
-        )
-        value_label.pack(
-            side=tk.LEFT, 
-            padx=5)
+# Build the remaining tabs one at a time while the GUI is idle
+def schedule_idle_tab_build():
+    global idle_build_scheduled
+
+    if not idle_build_scheduled:
+        idle_build_scheduled = True
+        root.after_idle(build_next_idle_tab)
+
+def build_next_idle_tab():
+    global idle_build_scheduled
+
+    idle_build_scheduled = False
+    if tab_pool is None:
+        return
+
+    # Always prefer the visible tab, then the rest in notebook order
+    on_notebook_tab_changed()
+    for tab_id in notebook.tabs():
+        tab = tab_pool.get(tab_id)
+        if tab and not tab.built and notebook.tab(tab_id, "state") != "hidden":
+            build_city_tab(tab)
+            schedule_idle_tab_build()
+            return
 
 # Fetch and display weather for all locations
 def get_weather():
-    global current_weather_data, notebook
-    
+    global active_fetch_batch, fetch_started_at, first_tab_pending, displayed_results
+
     if not location_entries:
         messagebox.showerror("Error", "Please add at least one location")
         return
 
-    current_weather_data = []
-    any_failures = False
-    
+    # Ignore repeated clicks while a batch is still in flight
+    if active_fetch_batch and not active_fetch_batch.done:
+        return
+
+    locations = []
     for city_entry, state_entry, country_entry in location_entries:
         city = city_entry.get().strip()
         state = state_entry.get().strip()
@@ -404,53 +167,181 @@ def get_weather():
         if country == 'US' and not state:
             messagebox.showerror("Error", "Please fill state field for US locations")
             return
-        
-        # Fetch weather data with error handling
-        weather_data, error_msg = fetch_weather_data(city, state, country)
-        
-        if error_msg:
-            print(f"Error for {city}, {country}: {error_msg}")  # Debug output
-            messagebox.showerror("Weather Error", 
-                               f"Failed to get weather for {city}, {country}:\n{error_msg}")
-            any_failures = True
-            continue
-            
-        if not weather_data:
-            print(f"No weather data for {city}, {country}")  # Debug output
-            any_failures = True
+
+        locations.append((city, state, country))
+
+    fetch_started_at = time.perf_counter()
+    first_tab_pending = True
+
+    # Switch to the results view right away; tabs appear as each location arrives
+    clear_weather_results()
+    toggle_input_visibility(show=False)
+    toggle_results_visibility(show=True)
+
+    if weather_button is not None:
+        weather_button.config(state="disabled")
+
+    # Fetch every location in parallel; results come back through the batch queue
+    displayed_results = {}
+    active_fetch_batch = FetchBatch(locations, fetch_location_weather).start()
+    show_fetch_progress(active_fetch_batch)
+    root.after(POLL_INTERVAL_MS, poll_weather_batch, active_fetch_batch, displayed_results, [])
+
+# Drain finished locations from the fetch engine on the Tk thread and show each one immediately
+def poll_weather_batch(batch, results, errors):
+    # The batch was abandoned (reset or logout) while it was in flight
+    if batch is not active_fetch_batch:
+        return
+
+    # Read done before draining: anything reported after this check is still in the
+    # queue for the next poll, so no location can finish unseen between the two
+    done = batch.done
+    show_batch_results(batch, results, errors)
+
+    if not done:
+        update_fetch_progress(batch)
+        root.after(POLL_INTERVAL_MS, poll_weather_batch, batch, results, errors)
+        return
+
+    # Finished, timed out by the deadline watchdog, or cancelled: pick up anything
+    # reported since the drain above before wrapping up
+    show_batch_results(batch, results, errors)
+    print(f"DEBUG::: Fetched {batch.completed}/{batch.total} location(s) in {batch.elapsed:.2f}s "
+          f"(weather cache: {weather_cache.stats()}, coalesced: {coalescing_stats()}, "
+          f"rate limit: {rate_limit_stats()})")
+    finish_weather_fetch(batch, errors)
+
+# Show every result (or collect its error) that has arrived in the batch queue
+def show_batch_results(batch, results, errors):
+    global current_weather_data
+
+    for index, (city, state, country), weather, error_msg in batch.drain():
+        if error_msg or not weather:
+            print(f"Error for {city}, {country}: {error_msg or 'no weather data'}")  # Debug output
+            if error_msg:
+                errors.append(f"{city}, {country}: {error_msg}")
             continue
-            
-        # Process the weather data
-        weather = process_weather_data(weather_data)
-        if weather:
-            current_weather_data.append({
-                "city": city,
-                "state": state,
-                "country": country,
-                **weather  # Merge the weather data
-            })
-        else:
-            any_failures = True
-    
-    # Display results if we have data
+
+        # The pool places the tab in the position the location was entered in
+        results[index] = weather
+        display_weather(weather, city, state, country, index=index)
+
+        current_weather_data = [results[i] for i in sorted(results)]
+        if len(results) == 1:
+            notebook.select(0)
+
+# Wrap up a finished or cancelled fetch
+def finish_weather_fetch(batch, errors):
+    hide_fetch_progress()
+
+    # Destroy pooled tabs this fetch did not reuse
+    tab_pool.end_refresh()
+
+    if weather_button is not None:
+        weather_button.config(state="normal")
+
+    if errors:
+        messagebox.showerror("Weather Error", 
+                             "Failed to get weather for:\n" + "\n".join(errors))
+
     if current_weather_data:
-        toggle_input_visibility(show=False)
-        toggle_results_visibility(show=True)
-        
-        # Clear existing tabs
-        if notebook:
-            for tab_id in notebook.tabs():
-                notebook.forget(tab_id)
-        
-        # Display weather for each location
-        for weather in current_weather_data:
-            display_weather(weather, weather['city'], weather['state'], weather['country'])
-        
         export_button_frame.pack(pady=10)
         root.geometry("950x1100")
-    elif not any_failures:
+        start_auto_refresh()
+        return
+
+    # Nothing to show: go back to the inputs
+    toggle_results_visibility(show=False)
+    toggle_input_visibility(show=True)
+    if not errors and not batch.cancelled:
         messagebox.showinfo("Info", "No weather data to display")
 
+# Cancel the fetch in progress; tabs that already arrived stay visible
+def cancel_weather_fetch():
+    batch = active_fetch_batch
+    if batch is None or batch.done:
+        return
+
+    # The poller sees the batch is done, shows what already arrived and wraps up
+    batch.cancel()
+    print(f"DEBUG::: Fetch cancelled after {batch.elapsed:.2f}s")
+
+# Remove the previous results before a new fetch starts
+def clear_weather_results():
+    global current_weather_data
+
+    current_weather_data = []
+    export_button_frame.pack_forget()
+    stop_auto_refresh()
+
+    # Hide the old tabs; the new fetch reuses them as its results arrive
+    if tab_pool is not None:
+        tab_pool.begin_refresh()
+
+# Keep the displayed locations up to date while auto-refresh is switched on
+def start_auto_refresh():
+    global refresh_scheduler
+
+    if not auto_refresh_var.get() or not displayed_results:
+        return
+
+    if refresh_scheduler is None:
+        refresh_scheduler = RefreshScheduler(
+            root, refresh_location_weather, is_location_fresh, on_auto_refresh_update,
+            on_unchanged=on_auto_refresh_unchanged)
+
+    refresh_scheduler.start({
+        index: (weather.location, weather)
+        for index, weather in displayed_results.items()
+    })
+
+def stop_auto_refresh():
+    if refresh_scheduler is not None:
+        refresh_scheduler.stop()
+
+# Menu toggle for auto-refresh
+def toggle_auto_refresh():
+    if auto_refresh_var.get():
+        start_auto_refresh()
+    else:
+        stop_auto_refresh()
+
+# Called by the refresh scheduler when a location's weather has changed
+def on_auto_refresh_update(index, location, weather):
+    global current_weather_data
+
+    displayed_results[index] = weather
+    current_weather_data = [displayed_results[i] for i in sorted(displayed_results)]
+
+    tab = tab_pool.claimed_tab(index)
+    if tab is not None:
+        tab.refresh(weather, *location)
+
+# Refreshed weather equal to what is shown: keep the newer record (for exports) and
+# move the tab's "Current Time" forward without redrawing the rest
+def on_auto_refresh_unchanged(index, location, weather):
+    global current_weather_data
+
+    displayed_results[index] = weather
+    current_weather_data = [displayed_results[i] for i in sorted(displayed_results)]
+
+    tab = tab_pool.claimed_tab(index)
+    if tab is not None:
+        tab.refresh_clock(weather)
+
+# Show the progress bar and cancel button above the results
+def show_fetch_progress(batch):
+    fetch_progress_bar.configure(maximum=batch.total, value=0)
+    fetch_progress_label.config(text=f"Fetching weather: 0 of {batch.total} locations")
+    fetch_progress_frame.pack(fill=tk.X, padx=20, pady=(10, 0), before=result_frame)
+
+def update_fetch_progress(batch):
+    fetch_progress_bar.configure(value=batch.completed)
+    fetch_progress_label.config(text=f"Fetching weather: {batch.completed} of {batch.total} locations")
+
+def hide_fetch_progress():
+    fetch_progress_frame.pack_forget()
+
 # Add a new location input row
 def add_location_input(parent_frame=None):  
     if len(location_entries) >= 5:
@@ -524,7 +415,7 @@ def add_location_input(parent_frame=None):
         font=("Helvetica", 14), 
         width=8,
         bootstyle="info",
-        values=list(fetch_country_codes().keys()),
+        values=get_country_code_list(),
         state="readonly")
     
     country_entry.set("US")  # Default to US
@@ -570,90 +461,13 @@ def create_weather_image(template_type="post"):
         return
         
     try:
-        template_path = TEMPLATE_PATHS.get(template_type, TEMPLATE_PATHS["post"])
-        image = Image.open(template_path)
-        draw = ImageDraw.Draw(image)
-        
-        # Try to load custom font, fallback to default
-        try:
-            font_large = ImageFont.truetype(DEFAULT_FONT, TEMPLATES[template_type]["font_sizes"]["large"])
-            font_medium = ImageFont.truetype(DEFAULT_FONT, TEMPLATES[template_type]["font_sizes"]["medium"])
-            font_title = ImageFont.truetype(DEFAULT_FONT, TEMPLATES[template_type]["font_sizes"]["title"])
-        except:
-            font_large = ImageFont.load_default()
-            font_medium = ImageFont.load_default()
-            font_title = ImageFont.load_default()
-        # Add date
-        today = date.today().strftime("%A - %B %d, %Y")
-        draw.text(
-            TEMPLATES[template_type]["date_position"], 
-            today, 
-            fill=TEXT_COLOR, 
-            font=font_medium
-        )
-        
-        country_codes = fetch_country_codes()
-
-        # Add weather for each location
-        for i, weather in enumerate(current_weather_data):
-            if i >= len(TEMPLATES[template_type]["city_position"]):
-                break
-
-            #Get the country name from the dictionary
-            country_code = weather['country'].upper()
-
-            # App Title
-            title_text = "Weather Forecast Generator"
-            title_pos = TEMPLATES[template_type]["title_position"]
-            draw.text(
-                title_pos,
-                title_text,
-                fill=TEXT_COLOR,
-                font=font_title,
-                align="center"
-            )
-
-            # City name
-            city_text = f"{weather['city'].title()}, {country_code}"
-            city_pos = TEMPLATES[template_type]["city_position"][i]
-            draw.text(
-                city_pos,  # Slightly above temp position
-                city_text,
-                fill=TEXT_COLOR_DARK,
-                font=font_large
-            )
-            
-            # Temperature
-            temp_text = f"{weather['temp_fahrenheit']}°F"
-            temp_pos = TEMPLATES[template_type]["temp_position"][i]
-            draw.text(
-                temp_pos,
-                temp_text,
-                fill=TEXT_COLOR,
-                font=font_large
-            )
-            
-            # Humidity (optional)
-            if "humidity_position" in TEMPLATES[template_type]:
-                hum_text = f"{weather['humidity']}%"
-                hum_pos = TEMPLATES[template_type]["humidity_position"][i]
-                draw.text(
-                    hum_pos,
-                    hum_text,
-                    fill=TEXT_COLOR,
-                    font=font_large
-                )
+        image = render_weather_image(current_weather_data, template_type)
         
         # Save the image
         save_dir = filedialog.askdirectory(title="Select Save Location")
         if save_dir:
-            filename = f"Weather_{template_type}_{today}.png"
-            save_path = os.path.join(save_dir, filename)
-            image.save(save_path)
-            
-            # Optionally save as PDF
-            pdf_path = os.path.join(save_dir, filename.replace(".png", ".pdf"))
-            image.convert("RGB").save(pdf_path)
+            filename = f"Weather_{template_type}_{template_date_text()}"
+            save_path, pdf_path = save_weather_image(image, save_dir, filename)
             
             messagebox.showinfo("Success", f"Exported to:\n{save_path}\n{pdf_path}")
             
@@ -664,7 +478,8 @@ def create_weather_image(template_type="post"):
 def init_gui(existing_root):
     global root, location_frame, export_button_frame, main_frame, header_frame
     global description_label_frame, description_label, button_frame
-    global image_references, logout_button, actions_menubar
+    global image_references, logout_button, actions_menubar, weather_button
+    global fetch_progress_frame, fetch_progress_bar, fetch_progress_label, auto_refresh_var
     
     root = existing_root
     root.title("Weather Forecast Automator")
@@ -748,6 +563,8 @@ def init_gui(existing_root):
     # File menu
     actions_menubar.add_command(label="Add Location", command=lambda: add_location_input(location_frame))
     actions_menubar.add_command(label="Get Weather", command=get_weather)
+    auto_refresh_var = tk.BooleanVar(value=AUTO_REFRESH_ENABLED)
+    actions_menubar.add_checkbutton(label="Auto Refresh", variable=auto_refresh_var, command=toggle_auto_refresh)
     actions_menubar.add_separator()
     actions_menubar.add_command(label="Export as Post", command=lambda: create_weather_image("post"))
     actions_menubar.add_command(label="Export as Story", command=lambda: create_weather_image("story"))
@@ -798,13 +615,9 @@ def init_gui(existing_root):
 
     # Load and set window icon
     try:
-        icon_path = "Images/FelipeWeatherAppLogo.png"
-        if os.path.exists(icon_path):
-            img = Image.open(icon_path)
-            img = img.resize((75, 75), Image.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            image_references['icon'] = photo  
-            root.iconphoto(True, photo)
+        photo = ImageTk.PhotoImage(get_logo(75))
+        image_references['icon'] = photo  
+        root.iconphoto(True, photo)
     except Exception as e:
         print(f"Could not load window icon: {e}")
 
@@ -819,11 +632,8 @@ def init_gui(existing_root):
 
     # Load logo image
     try:
-        logo_path = "Images/FelipeWeatherAppLogo.png"
-        if os.path.exists(logo_path):
-            img = Image.open(logo_path).resize((125, 125), Image.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            image_references['logo'] = photo 
+        photo = ImageTk.PhotoImage(get_logo(125))
+        image_references['logo'] = photo 
 
     except Exception as e:
         print(f"Could not load logo image: {e}") 
@@ -988,11 +798,45 @@ def init_gui(existing_root):
     # Ensure export buttons are hidden initially
     export_button_frame.pack_forget()
 
+    # Fetch progress (shown only while a fetch is running)
+    fetch_progress_frame = ttk.Frame(main_frame)
+
+    fetch_progress_label = ttk.Label(
+        fetch_progress_frame,
+        text="",
+        bootstyle="info",
+        font=("Helvetica", 13))
+
+    fetch_progress_label.pack(
+        side=tk.LEFT, 
+        padx=10)
+
+    fetch_progress_bar = ttkb.Progressbar(
+        fetch_progress_frame,
+        mode="determinate",
+        bootstyle="info-striped")
+
+    fetch_progress_bar.pack(
+        side=tk.LEFT, 
+        fill=tk.X, 
+        expand=True, 
+        padx=10)
+
+    cancel_fetch_button = ttk.Button(
+        fetch_progress_frame,
+        text="Cancel",
+        command=cancel_weather_fetch,
+        bootstyle="danger")
+
+    cancel_fetch_button.pack(
+        side=tk.LEFT, 
+        padx=10)
+
     return root
 
 # Show or hide the results and preview sections
 def toggle_results_visibility(show=True):
-    global result_frame, notebook, description_label_frame        
+    global result_frame, notebook, description_label_frame, tab_pool
 
     if show and not hasattr(toggle_results_visibility, "results_created"):
         result_frame = ttk.Frame(main_frame)
@@ -1022,17 +866,23 @@ def toggle_results_visibility(show=True):
         notebook.pack(
             fill=tk.BOTH, 
             expand=True)
+
+        # Tab contents are built on demand when a tab is shown
+        notebook.bind("<<NotebookTabChanged>>", on_notebook_tab_changed)
+        tab_pool = CityTabPool(notebook)
         
         toggle_results_visibility.results_created = True
+
+    elif show:
+        # Results were hidden earlier in this session; show the same frame again
+        result_frame.pack(
+            fill=tk.BOTH, 
+            expand=True, 
+            pady=10, 
+            padx=10)
         
     elif not show and hasattr(toggle_results_visibility, "results_created"):
-        # Clear all tabs and widgets
-        for tab_id in notebook.tabs():
-            notebook.forget(tab_id)
-        
-        # Clear meter widget references
-        meter_widgets.clear()
-        
+        # Tabs stay in the pool so the next fetch can reuse them
         result_frame.pack_forget()
 
 # Show or hide the input elements (description, location inputs, buttons)
@@ -1048,7 +898,7 @@ def toggle_input_visibility(show=True):
 
 # Reset the input view to its initial state
 def reset_input_view():
-    global current_weather_data, location_entries, input_elements, notebook
+    global current_weather_data, location_entries, input_elements, notebook, active_fetch_batch
     
     # Destroy all widgets in the location_frame
     for widget in location_frame.winfo_children():
@@ -1058,19 +908,22 @@ def reset_input_view():
     location_entries.clear()
     input_elements.clear()
     current_weather_data = []
-    meter_widgets.clear()
+    displayed_results.clear()
+
+    # Abort a fetch that is still in flight and stop refreshing the old results
+    if active_fetch_batch is not None:
+        active_fetch_batch.cancel()
+        active_fetch_batch = None
+    hide_fetch_progress()
+    stop_auto_refresh()
+    weather_button.config(state="normal")
     
-    # Clear notebook tabs if it exists
-    if notebook:
-        for tab_id in notebook.tabs():
-            notebook.forget(tab_id)
+    # Hide the tabs; they stay pooled for the next fetch
+    if tab_pool is not None:
+        tab_pool.begin_refresh()
     
     # Hide export buttons
     export_button_frame.pack_forget()
-
-    # Clear the result flag
-    if hasattr(toggle_results_visibility, "results_created"):
-        del toggle_results_visibility.results_created
     
     # Re-add the initial location input
     add_location_input(location_frame)
@@ -1081,23 +934,14 @@ def reset_input_view():
     # Reset window size
     root.geometry("950x1100")
 
-# Fetch country codes from Firestore and populate the country entry
-def fetch_country_codes():
-    try:
-        countries_ref = db.collection("countries")
-        countries = countries_ref.stream()
-        
-        country_codes = {doc.id: doc.to_dict()["name"] for doc in countries}
-        return country_codes
-    except Exception as e:
-        print(f"Error fetching country codes: {e}")
-        return {}
-
 # Define on_login_success at the module level
 def on_login_success(uid, user_data):
     global root, actions_menubar
 
     session_state.current_user_uid = uid
+
+    # Keep the profile in memory and current through a Firestore listener
+    profile_store.start(uid, user_data)
     
     # Destroy login screen widgets
     for widget in root.winfo_children():
@@ -1108,23 +952,43 @@ def on_login_success(uid, user_data):
 
     # Initialize your existing GUI exactly as before
     init_gui(root)
+
+    # Pick up country list changes from Firestore without delaying the UI
+    if COUNTRY_CODES_SYNC:
+        sync_country_codes_in_background()
     
     # Optional: Print login confirmation
     print(f"User logged in: {user_data.get('name', 'User')}")
     print(f"DEBUG::: [LOGIN SUCCESS] UID set to {uid}")
+    print(f"DEBUG::: [PRELOAD] {preloader.stats()}")
 
 # Logout user and clear session data
 def logout_user():
-    global root, current_weather_data, location_entries, input_elements
+    global root, current_weather_data, location_entries, input_elements, active_fetch_batch, tab_pool
     
     # Add confirmation dialog
     if not messagebox.askyesno("Logout", "Are you sure you want to logout?"):
         return
 
+    # Stop the profile listener and forget the saved session, so the next start
+    # asks for the password again
+    profile_store.stop()
+    clear_session()
+    session_state.current_user_uid = None
+
     # Clear all data
     current_weather_data = []
     location_entries = []
     input_elements = []
+    if active_fetch_batch is not None:
+        active_fetch_batch.cancel()
+        active_fetch_batch = None
+    stop_auto_refresh()
+    
+    # The pooled tabs and the results view are destroyed with the rest of the window
+    tab_pool = None
+    if hasattr(toggle_results_visibility, "results_created"):
+        del toggle_results_visibility.results_created
     
     # Destroy all widgets
     for widget in root.winfo_children():
@@ -1152,14 +1016,8 @@ def update_bootstyle_theme(theme_name):
     except Exception as e:
         messagebox.showerror("Theme Error", f"Failed to change theme: {str(e)}")
 
-# Main function to run the application
-def main():
-    global root  # Make root available globally
-    
-    if not configure():
-        return  # Exit if configuration fails
-
-    # Create root window
+# Create the root window, sized and centred for the login screen
+def create_root_window():
     root = Window(themename="pulse")
     root.title("Weather Forecast Automator")
 
@@ -1172,6 +1030,24 @@ def main():
     y = (screen_height // 2) - (window_height // 2)
     root.geometry(f"{window_width}x{window_height}+{x}+{y}")
     root.resizable(False, False)
+    return root
+
+# Main function to run the application
+def main():
+    global root  # Make root available globally
+
+    # --profile-startup [report.json]: measure a cold start instead of running the app
+    if "--profile-startup" in sys.argv:
+        from startup_profile import profile_startup
+        args = sys.argv[sys.argv.index("--profile-startup") + 1:]
+        profile_startup(args[0] if args else STARTUP_REPORT_PATH)
+        return
+    
+    if not configure():
+        return  # Exit if configuration fails
+
+    # Create root window
+    root = create_root_window()
 
     # Show login screen first
     LoginScreen(root, on_login_success)
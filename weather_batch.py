@@ -0,0 +1,224 @@
+import time
+import numpy as np
+from weather_snapshot import WeatherSnapshot
+
+# Columnar version of process_weather_data for large headless runs.
+# All payloads are read in one pass into per-field NumPy arrays, then the unit
+# conversions and the timezone shifting/formatting are done once per column instead
+# of once per city. row(i) rebuilds the same dict that process_weather_data returns;
+# snapshot(i, ...) builds the WeatherSnapshot the render path takes.
+# Row i always belongs to payload i. Missing (empty) payloads keep their row, marked
+# False in batch.valid, and row(i)/snapshot(i) return None for them.
+
+# Numeric fields copied straight from payload["current"]: (field, source key, dtype)
+CURRENT_FIELDS = (
+    ("temp", "temp", np.float64),
+    ("feels_like", "feels_like", np.float64),
+    ("humidity", "humidity", np.int64),
+    ("pressure", "pressure", np.int64),
+    ("dew_point", "dew_point", np.float64),
+    ("uv_index", "uvi", np.float64),
+    ("clouds", "clouds", np.int64),
+    ("sea_level", "sea_level", np.int64),
+    ("visibility", "visibility", np.int64),
+    ("wind_speed", "wind_speed", np.float64),
+    ("wind_deg", "wind_deg", np.int64),
+    ("wind_gust", "wind_gust", np.float64),
+    ("sunrise", "sunrise", np.int64),
+    ("sunset", "sunset", np.int64),
+)
+
+METERS_PER_MILE = 1609.34
+
+def celsius_to_fahrenheit(values):
+    return values * 9 / 5 + 32
+
+# Format UNIX timestamps shifted by per-row offsets: returns ("HH:MM:SS", "YYYY-MM-DD") arrays
+def format_local_times(timestamps, offsets):
+    local = (timestamps + offsets).astype("datetime64[s]")
+    text = np.datetime_as_string(local, unit="s")   # "YYYY-MM-DDTHH:MM:SS"
+    dates, _, times = np.char.partition(text, "T").T
+    return times, dates
+
+class WeatherBatch:
+    def __init__(self, columns, size, observed_at=None, valid=None):
+        self.columns = columns
+        self.size = size
+        self.observed_at = observed_at if observed_at is not None else time.time()
+        self.valid = valid if valid is not None else np.ones(size, dtype=bool)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    # Per-row view with the same keys and value types as process_weather_data
+    def row(self, i):
+        if not self.valid[i]:
+            return None
+        c = self.columns
+        return {
+            #Temperature Data
+            "temp_celsius": c["temp_celsius"][i].item(),
+            "temp_fahrenheit": c["temp_fahrenheit"][i].item(),
+            "feels_like_celsius": c["feels_like_celsius"][i].item(),
+            "feels_like_fahrenheit": c["feels_like_fahrenheit"][i].item(),
+            "temp_min_celsius": c["temp_min_celsius"][i].item(),
+            "temp_min_fahrenheit": c["temp_min_fahrenheit"][i].item(),
+            "temp_max_celsius": c["temp_max_celsius"][i].item(),
+            "temp_max_fahrenheit": c["temp_max_fahrenheit"][i].item(),
+
+            #Atmospheric Data
+            "pressure": c["pressure"][i].item(),
+            "humidity": c["humidity"][i].item(),
+            "dew_point": c["dew_point"][i].item(),
+            "uv_index": c["uv_index"][i].item(),
+            "clouds": c["clouds"][i].item(),
+            "visibility": c["visibility"][i].item() or 0,
+            "sea_level": c["sea_level"][i].item(),
+
+            #Weather Conditions
+            "condition": c["condition"][i],
+            "description": c["description"][i],
+            "icon": c["icon"][i],
+
+            #Wind Data
+            "wind_speed": c["wind_speed"][i].item(),
+            "wind_deg": c["wind_deg"][i].item(),
+            "wind_gust": c["wind_gust"][i].item(),
+
+            #Sunrise/Sunset Data
+            "sunrise": str(c["sunrise"][i]),
+            "sunset": str(c["sunset"][i]),
+
+            #Location Data
+            "timezone": c["timezone"][i].item(),
+            "timezone_name": c["timezone_name"][i],
+            "current_time": str(c["current_time"][i]),
+            "current_date": str(c["current_date"][i])
+        }
+
+    def rows(self):
+        return (self.row(i) for i in range(self.size))
+
+    # WeatherSnapshot for row i; the clock strings are formatted lazily by the snapshot
+    def snapshot(self, i, city="", state="", country=""):
+        if not self.valid[i]:
+            return None
+        c = self.columns
+        return WeatherSnapshot(
+            city=city,
+            state=state,
+            country=country,
+            temp_celsius=c["temp_celsius"][i].item(),
+            temp_fahrenheit=c["temp_fahrenheit"][i].item(),
+            feels_like_celsius=c["feels_like_celsius"][i].item(),
+            feels_like_fahrenheit=c["feels_like_fahrenheit"][i].item(),
+            temp_min_celsius=c["temp_min_celsius"][i].item(),
+            temp_min_fahrenheit=c["temp_min_fahrenheit"][i].item(),
+            temp_max_celsius=c["temp_max_celsius"][i].item(),
+            temp_max_fahrenheit=c["temp_max_fahrenheit"][i].item(),
+            pressure=c["pressure"][i].item(),
+            humidity=c["humidity"][i].item(),
+            dew_point=c["dew_point"][i].item(),
+            uv_index=c["uv_index"][i].item(),
+            clouds=c["clouds"][i].item(),
+            visibility=c["visibility"][i].item() or 0,
+            sea_level=c["sea_level"][i].item(),
+            condition=c["condition"][i],
+            description=c["description"][i],
+            icon=c["icon"][i],
+            wind_speed=c["wind_speed"][i].item(),
+            wind_deg=c["wind_deg"][i].item(),
+            wind_gust=c["wind_gust"][i].item(),
+            timezone=c["timezone"][i].item(),
+            timezone_name=c["timezone_name"][i],
+            sunrise_ts=c["sunrise_ts"][i].item(),
+            sunset_ts=c["sunset_ts"][i].item(),
+            observed_at=self.observed_at
+        )
+
+# Process many One Call payloads at once into a WeatherBatch
+def process_weather_batch(payloads):
+    payloads = list(payloads)
+    size = len(payloads)
+    valid = np.array([bool(data) for data in payloads], dtype=bool)
+
+    raw = {field: np.zeros(size, dtype=dtype) for field, _, dtype in CURRENT_FIELDS}
+    temp_min = np.full(size, np.nan)
+    temp_max = np.full(size, np.nan)
+    offsets = np.zeros(size, dtype=np.int64)
+    condition, description, icon, timezone_name = [], [], [], []
+
+    # One pass over the JSON: the only per-city Python work left
+    for i, data in enumerate(payloads):
+        data = data or {}
+        current = data.get("current", {})
+        for field, key, _ in CURRENT_FIELDS:
+            value = current.get(key)
+            if value:
+                raw[field][i] = value
+
+        daily_temp = (data.get("daily") or [{}])[0].get("temp", {})
+        if "min" in daily_temp:
+            temp_min[i] = daily_temp["min"]
+        if "max" in daily_temp:
+            temp_max[i] = daily_temp["max"]
+
+        offsets[i] = data.get("timezone_offset", 0)
+        timezone_name.append(data.get("timezone", ""))
+
+        weather = current.get("weather", [{}])[0]
+        condition.append(weather.get("main", ""))
+        description.append(weather.get("description", "").capitalize())
+        icon.append(weather.get("icon", ""))
+
+    temp = raw["temp"]
+    feels_like = raw["feels_like"]
+    # Like process_weather_data, fall back to the current temperature
+    temp_min = np.where(np.isnan(temp_min), temp, temp_min)
+    temp_max = np.where(np.isnan(temp_max), temp, temp_max)
+
+    sunrise, _ = format_local_times(raw["sunrise"], offsets)
+    sunset, _ = format_local_times(raw["sunset"], offsets)
+    observed_at = time.time()
+    current_time, current_date = format_local_times(np.full(size, int(observed_at), dtype=np.int64), offsets)
+
+    columns = {
+        "temp_celsius": np.round(temp, 2),
+        "temp_fahrenheit": np.round(celsius_to_fahrenheit(temp), 1),
+        "feels_like_celsius": np.round(feels_like, 2),
+        "feels_like_fahrenheit": celsius_to_fahrenheit(feels_like),
+        "temp_min_celsius": np.round(temp_min, 2),
+        "temp_min_fahrenheit": celsius_to_fahrenheit(temp_min),
+        "temp_max_celsius": np.round(temp_max, 2),
+        "temp_max_fahrenheit": np.round(celsius_to_fahrenheit(temp_max), 2),
+
+        "pressure": raw["pressure"],
+        "humidity": raw["humidity"],
+        "dew_point": celsius_to_fahrenheit(raw["dew_point"]),
+        "uv_index": np.round(raw["uv_index"], 2),
+        "clouds": raw["clouds"],
+        "visibility": np.round(raw["visibility"] / METERS_PER_MILE, 1),
+        "sea_level": raw["sea_level"],
+
+        "condition": condition,
+        "description": description,
+        "icon": icon,
+
+        "wind_speed": np.round(raw["wind_speed"], 2),
+        "wind_deg": raw["wind_deg"],
+        "wind_gust": np.round(raw["wind_gust"], 2),
+
+        "sunrise": sunrise,
+        "sunset": sunset,
+        "sunrise_ts": raw["sunrise"],
+        "sunset_ts": raw["sunset"],
+
+        "timezone": offsets,
+        "timezone_name": timezone_name,
+        "current_time": current_time,
+        "current_date": current_date
+    }
+    return WeatherBatch(columns, size, observed_at, valid)
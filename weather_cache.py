@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+from settings import WEATHER_CACHE_TTL, WEATHER_CACHE_PRECISION, WEATHER_CACHE_SIZE
+
+# In-memory cache of One Call payloads keyed by rounded (lat, lon).
+# Within the TTL a payload is served instantly. Past the TTL the stale payload is
+# still returned right away while a background thread refreshes it
+# (stale-while-revalidate), so the caller never waits on a refresh.
+# Each entry remembers which One Call parts (current, hourly, daily, ...) it holds; a
+# request is only served from an entry that has every part it asks for, and a refetch
+# asks for the union so one consumer's call never drops another's parts.
+class WeatherCache:
+    def __init__(self, ttl=WEATHER_CACHE_TTL, precision=WEATHER_CACHE_PRECISION,
+                 max_entries=WEATHER_CACHE_SIZE):
+        self.ttl = ttl
+        self.precision = precision
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+        self._entries = OrderedDict()  # key -> (fetched_at, payload, parts)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def make_key(self, lat, lon):
+        return round(lat, self.precision), round(lon, self.precision)
+
+    def _store(self, key, payload, parts):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), payload, parts)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # True if a payload with the given parts exists for these coordinates and is younger
+    # than the TTL. slack seconds are taken off the TTL, for callers on their own schedule.
+    def is_fresh(self, lat, lon, parts=frozenset(), slack=0):
+        with self._lock:
+            entry = self._entries.get(self.make_key(lat, lon))
+        return (entry is not None and time.monotonic() - entry[0] < self.ttl - slack
+                and entry[2] >= parts)
+
+    # Return (payload, error) for the coordinates holding at least `parts`.
+    # fetch_func(parts) must return (payload, error) and is only called on a miss or,
+    # in the background, when stale. With allow_stale=False a stale payload is
+    # refetched synchronously instead. slack shortens the TTL as in is_fresh().
+    def get_or_fetch(self, lat, lon, fetch_func, allow_stale=True, parts=frozenset(), slack=0):
+        key = self.make_key(lat, lon)
+        fetch_parts = parts
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Any refetch keeps the parts already cached for other consumers
+                fetch_parts = parts | entry[2]
+                if not entry[2] >= parts:
+                    entry = None  # Cached, but without a part this caller needs
+            if entry is not None:
+                fetched_at, payload, cached_parts = entry
+                self._entries.move_to_end(key)
+                if time.monotonic() - fetched_at < self.ttl - slack:
+                    self.hits += 1
+                    return payload, None
+
+                if allow_stale:
+                    # Stale: serve it now and refresh once in the background
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, fetch_func, cached_parts),
+                            name="weather-cache-refresh",
+                            daemon=True).start()
+                    return payload, None
+
+            self.misses += 1
+
+        payload, error = fetch_func(fetch_parts)
+        if payload is not None and not error:
+            self._store(key, payload, fetch_parts)
+        return payload, error
+
+    def _refresh(self, key, fetch_func, parts):
+        try:
+            payload, error = fetch_func(parts)
+            if payload is not None and not error:
+                self._store(key, payload, parts)
+                with self._lock:
+                    self.refreshes += 1
+            else:
+                print(f"Background weather refresh failed for {key}: {error}")
+        except Exception as e:
+            # Keep serving the stale payload; the next stale hit will try again
+            print(f"Background weather refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "entries": len(self._entries)
+            }
+
+# Shared instance used by fetch_weather_data
+weather_cache = WeatherCache()
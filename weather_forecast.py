@@ -0,0 +1,122 @@
+from array import array
+from datetime import datetime, timezone
+
+# Hourly and daily forecast series from the One Call payload.
+# When those parts are requested, the One Call payload carries 48 hourly and 8 daily
+# entries; process_forecast reads them in one pass into compact typed arrays, with
+# Fahrenheit conversion and every timestamp shifted to the location's local time, so
+# multi-day tabs and templates need no extra API calls.
+
+# (column, source key, typecode) read from each hourly entry
+HOURLY_FIELDS = (
+    ("temp", "temp", "d"),
+    ("feels_like", "feels_like", "d"),
+    ("humidity", "humidity", "B"),
+    ("clouds", "clouds", "B"),
+    ("pop", "pop", "d"),  # Probability of precipitation, 0..1
+    ("wind_speed", "wind_speed", "d"),
+    ("uv_index", "uvi", "d"),
+)
+
+# (column, source key, typecode) read from each daily entry; "temp" is a dict there
+DAILY_FIELDS = (
+    ("humidity", "humidity", "B"),
+    ("clouds", "clouds", "B"),
+    ("pop", "pop", "d"),
+    ("wind_speed", "wind_speed", "d"),
+    ("uv_index", "uvi", "d"),
+)
+
+def celsius_to_fahrenheit(values):
+    return array("d", (value * 9/5 + 32 for value in values))
+
+# One forecast series (hourly or daily). times holds local timestamps, i.e. UTC
+# seconds already shifted by the location's timezone offset.
+class ForecastSeries:
+    def __init__(self, times, columns, conditions, icons):
+        self.times = times
+        self.columns = columns
+        self.conditions = conditions
+        self.icons = icons
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    # Same entries with the same values (arrays compare element by element)
+    def __eq__(self, other):
+        if not isinstance(other, ForecastSeries):
+            return NotImplemented
+        return (self.times == other.times and self.columns == other.columns
+                and self.conditions == other.conditions and self.icons == other.icons)
+
+    # Local time of entry i formatted with strftime, e.g. "%a" -> "Mon", "%H:%M" -> "14:00"
+    def label(self, i, fmt):
+        return datetime.fromtimestamp(self.times[i], timezone.utc).strftime(fmt)
+
+class WeatherForecast:
+    def __init__(self, hourly, daily, timezone_offset):
+        self.hourly = hourly
+        self.daily = daily
+        self.timezone_offset = timezone_offset
+
+    # Compared by value, so a refresh that only moves the forecast still counts as a change
+    def __eq__(self, other):
+        if not isinstance(other, WeatherForecast):
+            return NotImplemented
+        return (self.hourly == other.hourly and self.daily == other.daily
+                and self.timezone_offset == other.timezone_offset)
+
+    # (day, high °F, low °F, condition, icon) for the first `days` days, today included
+    def daily_summary(self, days):
+        daily = self.daily
+        return [
+            (daily.label(i, "%a"),
+             round(daily["temp_max_fahrenheit"][i]),
+             round(daily["temp_min_fahrenheit"][i]),
+             daily.conditions[i],
+             daily.icons[i])
+            for i in range(min(days, len(daily)))
+        ]
+
+# Read one list of forecast entries into a ForecastSeries
+def _read_series(entries, fields, tz_offset, daily=False):
+    times = array("q")
+    columns = {name: array(typecode) for name, _, typecode in fields}
+    conditions, icons = [], []
+    if daily:
+        columns["temp_min"] = array("d")
+        columns["temp_max"] = array("d")
+
+    for entry in entries:
+        times.append(entry.get("dt", 0) + tz_offset)
+        for name, key, _ in fields:
+            columns[name].append(entry.get(key) or 0)
+        if daily:
+            temp = entry.get("temp", {})
+            columns["temp_min"].append(temp.get("min", 0))
+            columns["temp_max"].append(temp.get("max", 0))
+
+        weather = entry.get("weather", [{}])[0]
+        conditions.append(weather.get("main", ""))
+        icons.append(weather.get("icon", ""))
+
+    for name in ("temp", "feels_like", "temp_min", "temp_max"):
+        if name in columns:
+            columns[f"{name}_fahrenheit"] = celsius_to_fahrenheit(columns[name])
+
+    return ForecastSeries(times, columns, conditions, icons)
+
+# Process the hourly and daily parts of a One Call payload into a WeatherForecast
+def process_forecast(data):
+    if not data:
+        return None
+
+    tz_offset = data.get("timezone_offset", 0)
+    return WeatherForecast(
+        hourly=_read_series(data.get("hourly", []), HOURLY_FIELDS, tz_offset),
+        daily=_read_series(data.get("daily", []), DAILY_FIELDS, tz_offset, daily=True),
+        timezone_offset=tz_offset
+    )
@@ -0,0 +1,215 @@
+import json
+import os
+import time
+import requests
+from urllib.parse import urlencode
+import http_client
+import owm_transport
+from geocode_cache import GeocodeCache, geocode_cache
+from settings import (TEMPLATES, FORECAST_DAYS, ONECALL_PARTS, ONECALL_DEFAULT_PARTS,
+                      GUI_ONECALL_PARTS, OWM_BASE_URL, HTTP_RETRIES)
+from rate_limiter import (owm_rate_limiter, RateLimitExceeded, PRIORITY_INTERACTIVE,
+                          PRIORITY_BATCH, PRIORITY_BACKGROUND)
+from single_flight import SingleFlight
+from weather_cache import weather_cache
+from weather_forecast import process_forecast
+from weather_snapshot import WeatherSnapshot
+
+# Fetching and processing of OpenWeatherMap data.
+# Kept free of tkinter so the GUI and the headless batch generator can both use it.
+
+# Concurrent requests for the same location (geocode) or the same rounded coordinates
+# and parts (One Call) share one in-flight request
+geocode_flight = SingleFlight("geocode")
+onecall_flight = SingleFlight("onecall")
+
+# Read a numeric Retry-After header, if the server sent one
+def retry_after_seconds(response):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+# GET an OpenWeatherMap URL through the shared rate limiter. Only One Call requests
+# count against the daily budget (daily=True).
+# Retries happen here rather than inside urllib3, so every attempt takes a token,
+# counts against the daily budget and reports its status: a 429 slows the limiter
+# down and its pause holds back the retry, while 5xx and connection errors back off.
+# Past deadline (a time.monotonic() value) no further attempt is sent.
+def owm_get(url, priority=PRIORITY_BATCH, daily=True, deadline=None):
+    for attempt in range(HTTP_RETRIES + 1):
+        last_attempt = attempt == HTTP_RETRIES
+        owm_rate_limiter.acquire(priority, daily=daily, deadline=deadline)
+        try:
+            response = http_client.get(url, retry=False)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if last_attempt:
+                raise
+            time.sleep(http_client.backoff_seconds(attempt))
+            continue
+
+        owm_rate_limiter.report(response.status_code, retry_after_seconds(response))
+        if last_attempt or response.status_code not in http_client.RETRY_STATUS_CODES:
+            return response
+        if response.status_code != 429:
+            time.sleep(http_client.backoff_seconds(attempt))
+
+# OpenWeatherMap API key from the environment. Replay (in-process, or through a
+# stand-in server set with OWM_BASE_URL) works without one.
+def owm_api_key():
+    if os.getenv("API_KEY"):
+        return os.getenv("API_KEY")
+    if owm_transport.replay_enabled() or owm_base_url() != OWM_BASE_URL:
+        return owm_transport.REPLAY_API_KEY
+    return None
+
+# OpenWeatherMap host; the OWM_BASE_URL environment variable can point every request
+# at a local stand-in server instead (see owm_transport.py)
+def owm_base_url():
+    return (os.getenv("OWM_BASE_URL") or OWM_BASE_URL).rstrip("/")
+
+def geocode_url(city_name, state_name, country_code, api_key):
+    if country_code == "US":
+        # For US, use state abbreviation
+        query = f"{city_name},{state_name},{country_code}"
+    else:
+        query = f"{city_name},{country_code}"
+    params = urlencode({"q": query, "units": "metric", "limit": 5, "appid": api_key})
+    return f"{owm_base_url()}/geo/1.0/direct?{params}"
+
+def onecall_url(lat, lon, parts, api_key):
+    params = urlencode({"lat": lat, "lon": lon, "exclude": exclude_param(parts),
+                        "units": "metric", "appid": api_key})
+    return f"{owm_base_url()}/data/3.0/onecall?{params}"
+
+# Look up a location's coordinates with the Direct Geocoding API. Returns (lat, lon, error)
+def geocode_location(city_name, state_name, country_code, api_key, priority=PRIORITY_BATCH, deadline=None):
+    geo_response = owm_get(geocode_url(city_name, state_name, country_code, api_key), priority, daily=False,
+                           deadline=deadline)
+    if geo_response.status_code != 200:
+        return None, None, f"Geocoding API error (Code: {geo_response.status_code})"
+    
+    geo_data = geo_response.json()
+    if not geo_data:
+        return None, None, f"Geocoding API returned no results for {city_name}, {state_name if country_code == 'US' else ''}, {country_code}"
+    
+    # Extract latitude and longitude
+    return geo_data[0]['lat'], geo_data[0]['lon'], None
+
+# Top-level One Call keys every consumer reads, whatever parts it asked for
+ONECALL_METADATA = ("lat", "lon", "timezone", "timezone_offset")
+
+# One Call parts an export template draws from: current conditions, plus the daily
+# series when the template has a forecast line and it is switched on
+def template_parts(template_type, forecast=True):
+    parts = {"current"}
+    if forecast and FORECAST_DAYS and "forecast_position" in TEMPLATES[template_type]:
+        parts.add("daily")
+    return frozenset(parts)
+
+# Value for the One Call exclude= parameter: every part nobody asked for
+def exclude_param(parts):
+    return ",".join(part for part in ONECALL_PARTS if part not in parts)
+
+# Keep only the requested parts (and the location metadata) of a payload
+def project_payload(payload, parts):
+    return {key: value for key, value in payload.items() if key in parts or key in ONECALL_METADATA}
+
+# Fetch the One Call payload for a pair of coordinates, asking only for `parts`.
+# Returns (weather_data, error)
+def fetch_onecall(lat, lon, api_key, parts=ONECALL_DEFAULT_PARTS, priority=PRIORITY_BATCH, deadline=None):
+    weather_response = owm_get(onecall_url(lat, lon, parts, api_key), priority, deadline=deadline)
+
+    if weather_response.status_code != 200:
+        return None, f"Weather API error (Code: {weather_response.status_code})"
+    
+    return project_payload(weather_response.json(), parts), None
+
+# Geocode a location and remember it in the geocode cache. Returns (lat, lon, error)
+def geocode_and_store(city_name, state_name, country_code, api_key, priority=PRIORITY_BATCH, deadline=None):
+    lat, lon, error_msg = geocode_location(city_name, state_name, country_code, api_key, priority, deadline)
+    if not error_msg:
+        geocode_cache.put(city_name, state_name, country_code, lat, lon)
+    return lat, lon, error_msg
+
+# How many geocode and One Call requests were served by an identical one in flight
+def coalescing_stats():
+    return {"geocode": geocode_flight.stats(), "onecall": onecall_flight.stats()}
+
+# Requests granted, 429s seen and today's One Call usage from the shared rate limiter
+def rate_limit_stats():
+    return owm_rate_limiter.stats()
+
+# Fetch weather data from OpenWeatherMap API with robust error handling
+# priority orders the request in the shared rate limiter (see rate_limiter.py); past
+# deadline (a time.monotonic() value) the limiter sends nothing more for this location
+def fetch_weather_data(city_name, state_name, country_code, allow_stale=True, parts=ONECALL_DEFAULT_PARTS,
+                       priority=PRIORITY_BATCH, slack=0, deadline=None):
+    api_key = owm_api_key()
+    if not api_key:
+        # Runs on a worker thread, so report the problem instead of showing a dialog
+        return None, "OpenWeatherMap API key not configured"
+    
+    # Step 1: Get coordinates for the city, from the geocode cache when we've seen it before
+    try:
+        coords = geocode_cache.get(city_name, state_name, country_code)
+        if coords:
+            lat, lon = coords
+        else:
+            lat, lon, error_msg = geocode_flight.do(
+                GeocodeCache.make_key(city_name, state_name, country_code),
+                lambda: geocode_and_store(city_name, state_name, country_code, api_key, priority, deadline))
+            if error_msg:
+                return None, error_msg
+
+    # Step 2: Use the coordinates to get weather data, served from the weather cache when fresh
+        def fetch(fetch_parts):
+            return onecall_flight.do(
+                (weather_cache.make_key(lat, lon), fetch_parts),
+                lambda: fetch_onecall(lat, lon, api_key, fetch_parts, priority, deadline))
+
+        return weather_cache.get_or_fetch(
+            lat, lon, fetch, allow_stale=allow_stale, parts=frozenset(parts), slack=slack)
+    
+    except RateLimitExceeded as e:
+        return None, str(e)
+    except requests.exceptions.Timeout:
+        return None, "Request timed out - server took too long to respond"
+    except requests.exceptions.ConnectionError:
+        return None, "Network connection failed - check your internet"
+    except json.JSONDecodeError:
+        return None, "Invalid response format - could not decode JSON"
+    except Exception as e:
+        return None, f"Unexpected error: {str(e)}"
+
+# Process the raw API data into a more usable format. The conversions live on
+# WeatherSnapshot; this keeps the plain dict form for callers that want one.
+def process_weather_data(data):
+    if not data:
+        return None
+    return WeatherSnapshot.from_payload(data).as_dict()
+
+# Fetch and process one location for a city tab; runs on a fetch engine worker thread
+def fetch_location_weather(city, state, country, allow_stale=True, priority=PRIORITY_INTERACTIVE, slack=0):
+    weather_data, error_msg = fetch_weather_data(city, state, country, allow_stale=allow_stale,
+                                                 parts=GUI_ONECALL_PARTS, priority=priority, slack=slack)
+    if error_msg:
+        return None, error_msg
+
+    if not weather_data:
+        return None, None
+
+    forecast = process_forecast(weather_data)
+    return WeatherSnapshot.from_payload(weather_data, city, state, country, forecast=forecast), None
+
+# Background refresh: always returns current data, never a stale cached payload.
+# Cached weather older than the TTL minus slack counts as stale here.
+def refresh_location_weather(city, state, country, slack=0):
+    return fetch_location_weather(city, state, country, allow_stale=False, priority=PRIORITY_BACKGROUND,
+                                  slack=slack)
+
+# True if the location's weather is cached and still within the TTL (minus slack)
+def is_location_fresh(city, state, country, slack=0):
+    coords = geocode_cache.get(city, state, country)
+    return coords is not None and weather_cache.is_fresh(*coords, parts=frozenset(GUI_ONECALL_PARTS),
+                                                         slack=slack)
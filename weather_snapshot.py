@@ -0,0 +1,172 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+
+def celsius_to_fahrenheit(value):
+    return value * 9/5 + 32
+
+# Format a UNIX timestamp in a location's local time
+def format_local(ts, tz_offset, fmt):
+    local_time = datetime.fromtimestamp(ts, timezone.utc) + timedelta(seconds=tz_offset)
+    return local_time.strftime(fmt)
+
+# Processed weather for one location. A slotted record with typed numeric fields in
+# place of the ~35-key dict process_weather_data used to build per location; the
+# clock strings (sunrise, sunset, current_time, current_date) are only formatted
+# when read. Two snapshots compare equal when their weather is the same, whenever
+# they were taken.
+@dataclass(slots=True)
+class WeatherSnapshot:
+    city: str
+    state: str
+    country: str
+
+    #Temperature Data
+    temp_celsius: float
+    temp_fahrenheit: float
+    feels_like_celsius: float
+    feels_like_fahrenheit: float
+    temp_min_celsius: float
+    temp_min_fahrenheit: float
+    temp_max_celsius: float
+    temp_max_fahrenheit: float
+
+    #Atmospheric Data
+    pressure: int
+    humidity: int
+    dew_point: float
+    uv_index: float
+    clouds: int
+    visibility: float
+    sea_level: int
+
+    #Weather Conditions
+    condition: str
+    description: str
+    icon: str
+
+    #Wind Data
+    wind_speed: float
+    wind_deg: int
+    wind_gust: float
+
+    #Location Data
+    timezone: int
+    timezone_name: str
+
+    # Raw UNIX timestamps behind the lazily formatted strings
+    sunrise_ts: int
+    sunset_ts: int
+    observed_at: float = field(default_factory=time.time, compare=False)
+    # Hourly/daily WeatherForecast from the same payload, when the caller wants it.
+    # Part of equality: a new day or changed highs/lows must redraw the tab.
+    forecast: object = field(default=None, repr=False)
+
+    # Build a snapshot straight from a One Call payload
+    @classmethod
+    def from_payload(cls, data, city="", state="", country="", forecast=None):
+        current = data.get("current", {})
+        daily = (data.get("daily") or [{}])[0]  # Get today's weather (absent when "daily" was excluded)
+
+        # Temperature data (using daily forecast for min/max)
+        temp = current.get("temp", 0)
+        feels_like = current.get("feels_like", 0)
+        temp_min = daily.get("temp", {}).get("min", temp)
+        temp_max = daily.get("temp", {}).get("max", temp)
+        visibility = current.get("visibility", 0)
+
+        # Weather conditions
+        weather = current.get("weather", [{}])[0]
+
+        return cls(
+            city=city,
+            state=state,
+            country=country,
+
+            temp_celsius=round(temp, 2),
+            temp_fahrenheit=round(celsius_to_fahrenheit(temp), 1),
+            feels_like_celsius=round(feels_like, 2),
+            feels_like_fahrenheit=celsius_to_fahrenheit(feels_like),
+            temp_min_celsius=round(temp_min, 2),
+            temp_min_fahrenheit=celsius_to_fahrenheit(temp_min),
+            temp_max_celsius=round(temp_max, 2),
+            temp_max_fahrenheit=round(celsius_to_fahrenheit(temp_max), 2),
+
+            pressure=current.get("pressure", 0),
+            humidity=current.get("humidity", 0),
+            dew_point=celsius_to_fahrenheit(current.get("dew_point", 0)),
+            uv_index=round(current.get("uvi", 0), 2),
+            clouds=current.get("clouds", 0),
+            visibility=round(visibility / 1609.34, 1) if visibility else 0,
+            sea_level=current.get("sea_level", 0),
+
+            condition=weather.get("main", ""),
+            description=weather.get("description", "").capitalize(),
+            icon=weather.get("icon", ""),
+
+            wind_speed=round(current.get("wind_speed", 0), 2),
+            wind_deg=current.get("wind_deg", 0),
+            wind_gust=round(current.get("wind_gust", 0), 2),
+
+            timezone=data.get("timezone_offset", 0),  # in seconds
+            timezone_name=data.get("timezone", ""),
+
+            sunrise_ts=current.get("sunrise", 0),
+            sunset_ts=current.get("sunset", 0),
+            forecast=forecast
+        )
+
+    #Sunrise/Sunset Data
+    @property
+    def sunrise(self):
+        return format_local(self.sunrise_ts, self.timezone, '%H:%M:%S')
+
+    @property
+    def sunset(self):
+        return format_local(self.sunset_ts, self.timezone, '%H:%M:%S')
+
+    # Local time and date at the moment the snapshot was taken
+    @property
+    def current_time(self):
+        return format_local(self.observed_at, self.timezone, '%H:%M:%S')
+
+    @property
+    def current_date(self):
+        return format_local(self.observed_at, self.timezone, '%Y-%m-%d')
+
+    # (city, state, country) as used by the fetch and refresh paths
+    @property
+    def location(self):
+        return self.city, self.state, self.country
+
+    # The weather fields as the dict process_weather_data has always returned
+    def as_dict(self):
+        return {
+            "temp_celsius": self.temp_celsius,
+            "temp_fahrenheit": self.temp_fahrenheit,
+            "feels_like_celsius": self.feels_like_celsius,
+            "feels_like_fahrenheit": self.feels_like_fahrenheit,
+            "temp_min_celsius": self.temp_min_celsius,
+            "temp_min_fahrenheit": self.temp_min_fahrenheit,
+            "temp_max_celsius": self.temp_max_celsius,
+            "temp_max_fahrenheit": self.temp_max_fahrenheit,
+            "pressure": self.pressure,
+            "humidity": self.humidity,
+            "dew_point": self.dew_point,
+            "uv_index": self.uv_index,
+            "clouds": self.clouds,
+            "visibility": self.visibility,
+            "sea_level": self.sea_level,
+            "condition": self.condition,
+            "description": self.description,
+            "icon": self.icon,
+            "wind_speed": self.wind_speed,
+            "wind_deg": self.wind_deg,
+            "wind_gust": self.wind_gust,
+            "sunrise": self.sunrise,
+            "sunset": self.sunset,
+            "timezone": self.timezone,
+            "timezone_name": self.timezone_name,
+            "current_time": self.current_time,
+            "current_date": self.current_date
+        }